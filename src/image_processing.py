@@ -3,6 +3,9 @@ Image Processing Module
 Contains image processing algorithms and pipeline management.
 """
 
+import hashlib
+import time
+from contextlib import contextmanager
 import cv2
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional
@@ -34,7 +37,57 @@ def create_preview_image(image: np.ndarray, max_size: int = 1024) -> Tuple[np.nd
     
     return preview_image, scale_factor
 
+def throttle_progress(progress_callback, final_percentage: int = 100, interval: float = 0.05,
+                      count: int = -1):
+    """
+    Wrap a progress callback so it is forwarded at most once per time interval.
+    
+    The first update and any update at or above final_percentage are always
+    forwarded, so the callback never misses the start or the end of the work.
+    
+    Args:
+        progress_callback: Callable taking (message, percentage)
+        final_percentage: Percentage of the last update, always forwarded
+        interval: Minimum delay in seconds between two forwarded updates
+        count: If positive, also forward an update each time progress enters a
+            new 1/count slice of 0-100%, even within the interval
+        
+    Returns:
+        Throttled callable with the same signature
+    """
+    last_forwarded = None
+    last_slice = None
+    
+    def throttled(message, percentage):
+        nonlocal last_forwarded, last_slice
+        now = time.monotonic()
+        current_slice = int(percentage * count // 100) if count > 0 else None
+        if (last_forwarded is None or percentage >= final_percentage
+                or now - last_forwarded >= interval
+                or (count > 0 and current_slice != last_slice)):
+            last_forwarded = now
+            last_slice = current_slice
+            progress_callback(message, percentage)
+    
+    return throttled
+
 class ImageProcessor:
+    # Minimum delay in seconds between two progress updates forwarded by process_image
+    progress_interval = 0.05
+    
+    # Parameter name prefixes read by each pipeline stage (keys of the stage cache)
+    STAGE_PARAMETER_PREFIXES = {
+        'white_balance': ('white_balance_', 'gray_world_', 'white_patch_', 'shades_of_gray_', 'grey_edge_', 'lake_'),
+        'udcp': ('udcp_',),
+        'beer_lambert': ('beer_lambert_',),
+        'color_rebalance': ('color_rebalance_',),
+        'histogram_equalization': ('hist_eq_',),
+        'multiscale_fusion': ('multiscale_fusion_', 'fusion_'),
+    }
+    
+    # Largest image (in pixels) whose stage outputs are cached: preview sized
+    STAGE_CACHE_MAX_PIXELS = 1024 * 1024
+    
     def __init__(self):
         # Initialize parameters with default values
         self.parameters = {
@@ -126,22 +179,71 @@ class ImageProcessor:
         # Auto-tune callback function
         self.auto_tune_callback = None
         
+        # Output of each pipeline stage from the last cached preview run:
+        # operation -> (signature, image)
+        self._stage_cache = {}
+        
+        # Parameter writes queued by batch_updates (None outside a batch)
+        self._pending_parameters = None
+        
+        # Names of the parameters read by each stage, resolved once
+        self._stage_parameter_names = {
+            operation: tuple(name for name in self.parameters if name.startswith(prefixes))
+            for operation, prefixes in self.STAGE_PARAMETER_PREFIXES.items()
+        }
+        # A parameter outside every stage would never invalidate a cached output
+        unmapped = set(self.parameters).difference(*self._stage_parameter_names.values())
+        assert not unmapped, f"Parameters not mapped to a pipeline stage: {sorted(unmapped)}"
+        
     def set_parameter(self, name: str, value: Any):
-        """Set a processing parameter"""
+        """Set a processing parameter (queued until the end of a batch_updates block)"""
         if name in self.parameters:
-            self.parameters[name] = value
+            if self._pending_parameters is not None:
+                self._pending_parameters[name] = value
+            else:
+                self.parameters[name] = value
+    
+    @contextmanager
+    def batch_updates(self):
+        """Queue parameter writes and apply them together on exit
+        
+        set_parameter and set_parameters calls are queued in order, and
+        get_parameter / get_all_parameters see the queued values. The pipeline keeps
+        reading the committed parameters until the block ends, so a run never sees
+        half of a multi-parameter change. Nested blocks join the outermost one.
+        """
+        if self._pending_parameters is not None:
+            yield
+            return
+        self._pending_parameters = {}
+        try:
+            yield
+        finally:
+            pending, self._pending_parameters = self._pending_parameters, None
+            self.set_parameters(pending)
+    
+    def set_parameters(self, parameters: Dict[str, Any]):
+        """Set several processing parameters at once (unknown names are ignored)"""
+        target = self.parameters if self._pending_parameters is None else self._pending_parameters
+        target.update((name, value) for name, value in parameters.items()
+                      if name in self.parameters)
     
     def set_auto_tune_callback(self, callback):
         """Set the auto-tune callback function"""
         self.auto_tune_callback = callback
             
     def get_parameter(self, name: str) -> Any:
-        """Get a processing parameter"""
+        """Get a processing parameter (including writes queued by batch_updates)"""
+        if self._pending_parameters is not None and name in self._pending_parameters:
+            return self._pending_parameters[name]
         return self.parameters.get(name)
         
     def get_all_parameters(self) -> Dict[str, Any]:
-        """Get all parameters"""
-        return self.parameters.copy()
+        """Get all parameters (including writes queued by batch_updates)"""
+        parameters = self.parameters.copy()
+        if self._pending_parameters is not None:
+            parameters.update(self._pending_parameters)
+        return parameters
         
     def get_default_parameters(self) -> Dict[str, Any]:
         """Get default parameters (copy of initial values)"""
@@ -240,10 +342,8 @@ class ImageProcessor:
             return
             
         # Reset parameters that match the step prefixes
-        for prefix in step_prefixes[step_key]:
-            for param_name, default_value in defaults.items():
-                if param_name.startswith(prefix):
-                    self.set_parameter(param_name, default_value)
+        prefixes = tuple(step_prefixes[step_key])
+        self.set_parameters({name: value for name, value in defaults.items() if name.startswith(prefixes)})
     
     def auto_tune_step(self, step_key: str, reference_image: np.ndarray) -> dict:
         """Auto-tune parameters for a specific processing step based on image analysis"""
@@ -265,75 +365,144 @@ class ImageProcessor:
         
         return {}
         
-    def process_image(self, image: np.ndarray, progress_callback=None) -> np.ndarray:
-        """Process an image through the complete pipeline with optional progress callback"""
-        result = image.copy()
+    def process_image(self, image: np.ndarray, progress_callback=None, scale: float = 1.0,
+                      progress_interval_ms: Optional[int] = None, progress_count: int = -1,
+                      max_dim: Optional[int] = None) -> np.ndarray:
+        """Process an image through the complete pipeline with optional progress callback
+        
+        A scale below 1.0 runs the pipeline on a downsampled copy and upsamples the
+        result back to the input size (draft quality, e.g. while dragging a slider).
+        max_dim caps the processed resolution the same way: larger inputs are
+        processed with their longest side reduced to max_dim.
+        
+        Step updates are forwarded to progress_callback at most once per
+        progress_interval_ms (default: progress_interval), or whenever progress
+        enters a new 1/progress_count slice when progress_count is positive.
+        An interval of 0 forwards every step.
+        
+        When no step is enabled the input image itself is returned, unchanged.
+        """
+        if max_dim is not None:
+            scale = min(scale, max_dim / max(image.shape[:2]))
+        if scale < 1.0:
+            height, width = image.shape[:2]
+            draft = cv2.resize(image, (max(1, int(width * scale)), max(1, int(height * scale))),
+                               interpolation=cv2.INTER_AREA)
+            result = self.process_image(draft, progress_callback,
+                                        progress_interval_ms=progress_interval_ms,
+                                        progress_count=progress_count)
+            return cv2.resize(result, (width, height), interpolation=cv2.INTER_NEAREST)
+        
+        return self._run_pipeline(image, progress_callback, progress_interval_ms, progress_count)
+    
+    def _run_pipeline(self, image: np.ndarray, progress_callback=None,
+                      progress_interval_ms: Optional[int] = None, progress_count: int = -1,
+                      use_cache: bool = False, auto_tune: bool = True) -> np.ndarray:
+        """Run the enabled pipeline stages on an image
+        
+        With use_cache, images up to STAGE_CACHE_MAX_PIXELS keep each stage output so
+        a rerun only executes the stages from the first changed one onward. Without
+        it, intermediate outputs are freed as the pipeline goes.
+        """
+        # Pipeline stages: enable flag, progress message and processing function
+        stages = {
+            'white_balance': ('white_balance_enabled', "Balance des blancs...", self.apply_white_balance),
+            'udcp': ('udcp_enabled', "Correction de canal sombre sous-marin...", self.underwater_dark_channel_prior),
+            'beer_lambert': ('beer_lambert_enabled', "Correction Beer-Lambert...", self.beer_lambert_correction),
+            'color_rebalance': ('color_rebalance_enabled', "Rééquilibrage des couleurs...", self.color_rebalance),
+            'histogram_equalization': ('hist_eq_enabled', "Égalisation d'histogramme adaptatif...",
+                                       self.adaptive_histogram_equalization),
+            'multiscale_fusion': ('multiscale_fusion_enabled', "Fusion multi-échelle...",
+                                  lambda processed: self.multiscale_fusion(image, processed)),
+        }
         
         # Get list of enabled steps for progress calculation
-        enabled_steps = []
-        for operation in self.pipeline_order:
-            if ((operation == 'white_balance' and self.parameters['white_balance_enabled']) or
-                (operation == 'udcp' and self.parameters['udcp_enabled']) or  
-                (operation == 'beer_lambert' and self.parameters['beer_lambert_enabled']) or
-                (operation == 'color_rebalance' and self.parameters['color_rebalance_enabled']) or
-                (operation == 'histogram_equalization' and self.parameters['hist_eq_enabled']) or
-                (operation == 'multiscale_fusion' and self.parameters['multiscale_fusion_enabled'])):
-                enabled_steps.append(operation)
+        enabled_steps = [operation for operation in self.pipeline_order
+                         if operation in stages and self.parameters[stages[operation][0]]]
         
         total_steps = len(enabled_steps)
         completed_steps = 0
         
+        # Forward step updates by time interval rather than per step; the first
+        # and last steps are always reported
+        if progress_callback and total_steps:
+            progress_callback = throttle_progress(
+                progress_callback,
+                final_percentage=10 + ((total_steps - 1) * 75 // total_steps),
+                interval=(self.progress_interval if progress_interval_ms is None
+                          else progress_interval_ms / 1000),
+                count=progress_count
+            )
+        
+        # Each stage output is cached under a signature chaining the input image
+        # and the parameters of every stage up to it, so only the stages from the
+        # first changed one onward are executed again
+        use_cache = use_cache and image.shape[0] * image.shape[1] <= self.STAGE_CACHE_MAX_PIXELS
+        result = image
+        signature = self._image_signature(image) if use_cache else None
+        
         for operation in self.pipeline_order:
             # Check if auto-tune is enabled for this step and perform it
-            if self.auto_tune_callback and self.auto_tune_callback(operation):
+            if auto_tune and self.auto_tune_callback and self.auto_tune_callback(operation):
                 #optimized_params = self.auto_tune_step(operation, image)
                 optimized_params = self.enhanced_auto_tune_step(image, operation)
                 # Apply optimized parameters directly to the processor
                 if optimized_params:
-                    for param_name, value in optimized_params.items():
-                        self.set_parameter(param_name, value)
+                    self.set_parameters(optimized_params)
+            
+            if operation not in stages:
+                continue
+            enabled_param, message, apply_stage = stages[operation]
+            if not self.parameters[enabled_param]:
+                continue
             
             # Execute the processing step with progress updates
-            if operation == 'white_balance' and self.parameters['white_balance_enabled']:
-                if progress_callback:
-                    progress_callback(f"Balance des blancs...", 10 + (completed_steps * 75 // total_steps))
-                result = self.apply_white_balance(result)
-                completed_steps += 1
-            elif operation == 'udcp' and self.parameters['udcp_enabled']:
-                if progress_callback:
-                    progress_callback(f"Correction de canal sombre sous-marin...", 10 + (completed_steps * 75 // total_steps))
-                result = self.underwater_dark_channel_prior(result)
-                completed_steps += 1
-            elif operation == 'beer_lambert' and self.parameters['beer_lambert_enabled']:
-                if progress_callback:
-                    progress_callback(f"Correction Beer-Lambert...", 10 + (completed_steps * 75 // total_steps))
-                result = self.beer_lambert_correction(result)
-                completed_steps += 1
-            elif operation == 'color_rebalance' and self.parameters['color_rebalance_enabled']:
-                if progress_callback:
-                    progress_callback(f"Rééquilibrage des couleurs...", 10 + (completed_steps * 75 // total_steps))
-                result = self.color_rebalance(result)
-                completed_steps += 1
-            elif operation == 'histogram_equalization' and self.parameters['hist_eq_enabled']:
-                if progress_callback:
-                    progress_callback(f"Égalisation d'histogramme adaptatif...", 10 + (completed_steps * 75 // total_steps))
-                result = self.adaptive_histogram_equalization(result)
-                completed_steps += 1
-            elif operation == 'multiscale_fusion' and self.parameters['multiscale_fusion_enabled']:
-                if progress_callback:
-                    progress_callback(f"Fusion multi-échelle...", 10 + (completed_steps * 75 // total_steps))
-                result = self.multiscale_fusion(image, result)
-                completed_steps += 1
-                
-        return result
+            if progress_callback:
+                progress_callback(message, 10 + (completed_steps * 75 // total_steps))
+            if use_cache:
+                signature = (signature, operation, self._stage_parameters(operation))
+                cached = self._stage_cache.get(operation)
+                if cached is not None and cached[0] == signature:
+                    result = cached[1]
+                else:
+                    result = apply_stage(result)
+                    self._stage_cache[operation] = (signature, result)
+            else:
+                result = apply_stage(result)
+            completed_steps += 1
+        
+        # Nothing enabled: the input is the result
+        if result is image or not use_cache:
+            return result
+        
+        # Cached stage outputs are shared: hand out a private copy
+        return result.copy()
     
-    def process_image_for_preview(self, image: np.ndarray, max_size: int = 1024) -> Tuple[np.ndarray, np.ndarray, float]:
+    def _stage_parameters(self, operation: str) -> Tuple:
+        """Values of the parameters read by a pipeline stage"""
+        parameters = self.parameters
+        return tuple(parameters[name] for name in self._stage_parameter_names[operation])
+    
+    @staticmethod
+    def _image_signature(image: np.ndarray) -> Tuple:
+        """Content signature of an image, used to key the stage cache"""
+        digest = hashlib.blake2b(np.ascontiguousarray(image).data, digest_size=16).digest()
+        return (image.shape, image.dtype.str, digest)
+    
+    def clear_stage_cache(self):
+        """Drop the cached pipeline stage outputs (e.g. when a new image is loaded)"""
+        self._stage_cache.clear()
+    
+    def process_image_for_preview(self, image: np.ndarray, max_size: int = 1024,
+                                  scale: float = 1.0) -> Tuple[np.ndarray, np.ndarray, float]:
         """
         Process an image for preview, using subsampling for large images.
         
         Args:
             image: Input image
             max_size: Maximum dimension for preview
+            scale: Draft factor applied on top of the preview size; the processed
+                preview is upsampled back to the preview size
             
         Returns:
             Tuple of (original_preview, processed_preview, scale_factor)
@@ -341,22 +510,21 @@ class ImageProcessor:
         # Create preview version of original image
         original_preview, scale_factor = create_preview_image(image, max_size)
         
-        # Process the preview image
-        processed_preview = original_preview.copy()
-        
-        for operation in self.pipeline_order:
-            if operation == 'white_balance' and self.parameters['white_balance_enabled']:
-                processed_preview = self.apply_white_balance(processed_preview)
-            elif operation == 'udcp' and self.parameters['udcp_enabled']:
-                processed_preview = self.underwater_dark_channel_prior(processed_preview)
-            elif operation == 'beer_lambert' and self.parameters['beer_lambert_enabled']:
-                processed_preview = self.beer_lambert_correction(processed_preview)
-            elif operation == 'color_rebalance' and self.parameters['color_rebalance_enabled']:
-                processed_preview = self.color_rebalance(processed_preview)
-            elif operation == 'histogram_equalization' and self.parameters['hist_eq_enabled']:
-                processed_preview = self.adaptive_histogram_equalization(processed_preview)
-            elif operation == 'multiscale_fusion' and self.parameters['multiscale_fusion_enabled']:
-                processed_preview = self.multiscale_fusion(original_preview, processed_preview)
+        # Process the preview image (or a draft-sized copy of it). Only full
+        # scale previews use the stage cache, so drafts never evict its entries
+        if scale < 1.0:
+            height, width = original_preview.shape[:2]
+            source = cv2.resize(original_preview, (max(1, int(width * scale)), max(1, int(height * scale))),
+                                interpolation=cv2.INTER_AREA)
+        else:
+            source = original_preview
+        processed_preview = self._run_pipeline(source, use_cache=scale >= 1.0, auto_tune=False)
+        if processed_preview is source:
+            processed_preview = source.copy()
+        
+        if processed_preview.shape[:2] != original_preview.shape[:2]:
+            height, width = original_preview.shape[:2]
+            processed_preview = cv2.resize(processed_preview, (width, height), interpolation=cv2.INTER_NEAREST)
                 
         return original_preview, processed_preview, scale_factor
     
@@ -2168,6 +2336,12 @@ class ImageProcessor:
     # ENHANCED AUTO-TUNE METHODS (Literature-based improvements)
     # =============================
 
+    @staticmethod
+    def _channel_statistics(img: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-channel means and standard deviations on a 0-1 scale, in one pass"""
+        means, stds = cv2.meanStdDev(img)
+        return means.ravel() / 255.0, stds.ravel() / 255.0
+
     def _enhanced_auto_tune_white_balance(self, img: np.ndarray) -> dict:
         """
         Enhanced auto-tune White Balance basé sur:
@@ -2178,8 +2352,7 @@ class ImageProcessor:
             if img is None or img.size == 0:
                 return {}
             
-            # 1. Conversion et analyse préliminaire
-            img_float = img.astype(np.float32) / 255.0
+            # 1. Analyse préliminaire
             h, w = img.shape[:2]
             
             # 2. Analyse histogram spread (Iqbal method)
@@ -2194,9 +2367,11 @@ class ImageProcessor:
             max_spread = max(spread_r, spread_g, spread_b)
             
             # 3. Distance euclidienne des canaux (Ancuti method)
-            r_mean = np.mean(img_float[:,:,2])
-            g_mean = np.mean(img_float[:,:,1])
-            b_mean = np.mean(img_float[:,:,0])
+            # Moyennes normalisées tirées des histogrammes, sans conversion float de l'image
+            levels = np.arange(256) / (255.0 * h * w)
+            r_mean = hist_r @ levels
+            g_mean = hist_g @ levels
+            b_mean = hist_b @ levels
             
             euclidean_distance = np.sqrt(
                 (r_mean - g_mean)**2 + 
@@ -2373,18 +2548,11 @@ class ImageProcessor:
             if img is None or img.size == 0:
                 return {}
             
-            img_float = img.astype(np.float32) / 255.0
             h, w = img.shape[:2]
             
             # 1. Spectral analysis based on Mobley's optical properties
-            b_channel = img_float[:,:,0]  # Blue (BGR)
-            g_channel = img_float[:,:,1]  # Green
-            r_channel = img_float[:,:,2]  # Red
-            
-            # Channel statistics for attenuation analysis
-            r_mean, r_std = np.mean(r_channel), np.std(r_channel)
-            g_mean, g_std = np.mean(g_channel), np.std(g_channel)
-            b_mean, b_std = np.mean(b_channel), np.std(b_channel)
+            # Channel statistics for attenuation analysis (BGR order)
+            (b_mean, g_mean, r_mean), (b_std, g_std, r_std) = self._channel_statistics(img)
             
             # 2. Water type classification using spectral ratios
             # Safe division to avoid numerical issues
@@ -2404,10 +2572,9 @@ class ImageProcessor:
             spectral_slope = (b_mean - r_mean) / (safe_b + r_mean)
             
             # 4. Scattering analysis via local variance
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            kernel = np.ones((15,15), np.float32) / 225
-            mean_filtered = cv2.filter2D(gray.astype(np.float32), -1, kernel)
-            scattering_estimate = np.mean(np.abs(gray.astype(np.float32) - mean_filtered)) / 255.0
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY).astype(np.float32)
+            mean_filtered = cv2.blur(gray, (15, 15))  # Normalized box filter, cost independent of size
+            scattering_estimate = np.mean(np.abs(gray - mean_filtered)) / 255.0
             
             # 5. Turbidity classification
             color_variance = np.mean([r_std, g_std, b_std])
@@ -2492,18 +2659,11 @@ class ImageProcessor:
             if img is None or img.size == 0:
                 return {}
             
-            img_float = img.astype(np.float32) / 255.0
             h, w = img.shape[:2]
             
             # 1. Channel analysis for underwater color cast detection
-            b_channel = img_float[:,:,0]  # Blue
-            g_channel = img_float[:,:,1]  # Green
-            r_channel = img_float[:,:,2]  # Red
-            
-            # Channel statistics
-            r_mean, r_std = np.mean(r_channel), np.std(r_channel)
-            g_mean, g_std = np.mean(g_channel), np.std(g_channel)
-            b_mean, b_std = np.mean(b_channel), np.std(b_channel)
+            # Channel statistics (BGR order)
+            (b_mean, g_mean, r_mean), (b_std, g_std, r_std) = self._channel_statistics(img)
             
             # 2. Color cast analysis (Peng & Cosman method)
             # Safe division to avoid numerical issues
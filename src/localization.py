@@ -10,10 +10,15 @@ from pathlib import Path
 class LocalizationManager:
     """Manages application localization"""
     
+    # Where the language preference is saved (relative to the working directory)
+    CONFIG_FILE = Path('aqualix_config.json')
+    
     def __init__(self, default_language='fr'):
-        self.config_file = Path('aqualix_config.json')
+        self.config_file = self.CONFIG_FILE
         self.current_language = self.load_saved_language() or default_language
         self.translations = {}
+        # Resolved translations: (language, key, sorted kwargs) -> text
+        self._cache = {}
         self.load_translations()
         
     def load_saved_language(self):
@@ -44,6 +49,8 @@ class LocalizationManager:
         
     def load_translations(self):
         """Load translation dictionaries"""
+        self._cache.clear()
+        
         # French translations (default)
         self.translations['fr'] = {
             # Main window
@@ -1036,6 +1043,7 @@ class LocalizationManager:
         """Set the current language"""
         if language in self.translations:
             self.current_language = language
+            self._cache.clear()
             self.save_language_preference(language)
             
     def get_language(self):
@@ -1048,6 +1056,14 @@ class LocalizationManager:
         
     def t(self, key, **kwargs):
         """Translate a key to current language"""
+        try:
+            cache_key = (self.current_language, key, tuple(sorted(kwargs.items())))
+            return self._cache[cache_key]
+        except KeyError:
+            pass
+        except TypeError:
+            cache_key = None  # Unhashable argument: translate without caching
+        
         if self.current_language not in self.translations:
             return key
             
@@ -1059,7 +1075,9 @@ class LocalizationManager:
                 translation = translation.format(**kwargs)
             except (KeyError, ValueError):
                 pass  # Return unformatted if formatting fails
-                
+        
+        if cache_key is not None:
+            self._cache[cache_key] = translation
         return translation
         
     def get_language_name(self, lang_code):
@@ -382,6 +382,7 @@ class ImageVideoProcessorApp:
                 
             # Convert BGR to RGB for display
             self.original_image = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2RGB)
+            self.processor.clear_stage_cache()
             
             # Check if auto-tune is enabled and trigger it for new image
             if hasattr(self.param_panel, 'global_auto_tune_var') and self.param_panel.global_auto_tune_var.get():
@@ -441,6 +442,7 @@ class ImageVideoProcessorApp:
                 # Convert BGR to RGB for display
                 self.original_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
                 self.current_frame = frame_number
+                self.processor.clear_stage_cache()
                 
                 # Update frame info
                 self.frame_info_label.config(text=f"{frame_number + 1}/{self.total_frames}")
@@ -461,14 +463,17 @@ class ImageVideoProcessorApp:
         if frame_number != self.current_frame:
             self.load_video_frame(frame_number)
             
-    def update_preview(self):
-        """Update the preview with processed image using optimized subsampling for large images"""
+    def update_preview(self, scale: float = 1.0):
+        """Update the preview with processed image using optimized subsampling for large images
+        
+        A scale below 1.0 renders a draft preview (used while a slider is dragged).
+        """
         if self.original_image is None:
             return
         try:
             # Use optimized preview processing
             self.original_preview, self.processed_preview, self.preview_scale_factor = self.processor.process_image_for_preview(
-                self.original_image.copy(), max_size=1024
+                self.original_image.copy(), max_size=1024, scale=scale
             )
             
             # Mark that full-size processed image needs to be updated when needed
@@ -9,6 +9,17 @@ from typing import Dict, List, Tuple, Any, Optional
 import logging
 
 
+def _to_builtin(value):
+    """Recursively convert NumPy scalars and arrays in analysis results to Python types"""
+    if isinstance(value, dict):
+        return {key: _to_builtin(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_builtin(item) for item in value)
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return value
+
+
 class PostProcessingQualityChecker:
     """Analyzes processed underwater images for quality issues and provides recommendations"""
     
@@ -17,6 +28,13 @@ class PostProcessingQualityChecker:
         self.recommendations = []
         self.logger = logging.getLogger(__name__)
         
+        # Features of the last original image analyzed: (image, features)
+        self._reference_cache = None
+        
+    def invalidate(self):
+        """Forget the original image features (call when an original array is modified in place)"""
+        self._reference_cache = None
+        
     def run_all_checks(self, original_image: np.ndarray, processed_image: np.ndarray) -> Dict[str, Any]:
         """
         Run comprehensive quality analysis on processed image
@@ -32,25 +50,33 @@ class PostProcessingQualityChecker:
         self.recommendations = []
         
         try:
+            # Original image features, shared by the checks comparing both images
+            reference = self._reference_features(original_image)
+            
+            # The same array may be passed for both (analysis of an unprocessed
+            # image); the comparison checks then reuse the original features
+            same_image = original_image is processed_image
+            
             # Convert images to different color spaces for analysis
-            processed_rgb = cv2.cvtColor(processed_image, cv2.COLOR_BGR2RGB)
+            if same_image:
+                processed_rgb = reference['rgb']
+            else:
+                processed_rgb = cv2.cvtColor(processed_image, cv2.COLOR_BGR2RGB)
             processed_hsv = cv2.cvtColor(processed_image, cv2.COLOR_BGR2HSV)
             processed_lab = cv2.cvtColor(processed_image, cv2.COLOR_BGR2LAB)
             
-            original_rgb = cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB)
-            
             # Run individual checks
             self._check_unrealistic_colors(processed_rgb)
             self._check_red_channel_analysis(processed_rgb)
             self._check_saturation_clipping(processed_hsv)
-            self._check_color_noise_amplification(original_rgb, processed_rgb)
+            self._check_color_noise_amplification(reference, processed_rgb, same_image)
             self._check_halo_artifacts(processed_image)
             self._check_midtone_balance(processed_lab)
             
             # Calculate quality improvements
-            self._calculate_quality_improvements(original_image, processed_image)
+            self._calculate_quality_improvements(reference, processed_image, same_image)
             
-            # Compile final results
+            # Compile final results (NumPy scalars converted once, in bulk)
             results = {
                 'unrealistic_colors': self.analysis_results.get('unrealistic_colors', {}),
                 'red_channel_analysis': self.analysis_results.get('red_channel_analysis', {}),
@@ -62,15 +88,53 @@ class PostProcessingQualityChecker:
                 'overall_recommendations': [rec for rec in self.recommendations]
             }
             
-            return results
+            return _to_builtin(results)
             
         except Exception as e:
             self.logger.error(f"Error in quality analysis: {str(e)}")
             return {
                 'error': str(e),
-                'partial_results': self.analysis_results
+                'partial_results': _to_builtin(self.analysis_results)
             }
     
+    def _reference_features(self, original_image: np.ndarray) -> Dict[str, Any]:
+        """
+        Features of the original image used by the comparison checks
+        
+        They are kept for the last original array analyzed (keyed on its identity),
+        so comparing several processed versions against one original computes them
+        once. Modifying that array in place requires a call to `invalidate()`.
+        """
+        if self._reference_cache is not None and self._reference_cache[0] is original_image:
+            return self._reference_cache[1]
+        
+        original_rgb = cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB)
+        
+        # Noise in low-light areas (local variance of each channel)
+        rgb_gray = cv2.cvtColor(original_rgb, cv2.COLOR_RGB2GRAY).astype(np.float32) / 255.0
+        low_light_mask = rgb_gray < 0.3
+        if low_light_mask.any():
+            orig_float = original_rgb.astype(np.float32) / 255.0
+            noise = [np.var(cv2.Laplacian(orig_float[:, :, i], cv2.CV_32F)[low_light_mask])
+                     for i in range(3)]
+        else:
+            noise = None
+        
+        # Contrast, entropy and color variance (a* and b* channels)
+        gray = cv2.cvtColor(original_image, cv2.COLOR_BGR2GRAY)
+        lab = cv2.cvtColor(original_image, cv2.COLOR_BGR2LAB)
+        
+        features = {
+            'rgb': original_rgb,
+            'low_light_mask': low_light_mask,
+            'noise': noise,
+            'contrast': np.std(gray),
+            'entropy': self._calculate_entropy(gray),
+            'color_var': np.var(lab[:, :, 1]) + np.var(lab[:, :, 2])
+        }
+        self._reference_cache = (original_image, features)
+        return features
+    
     def _check_unrealistic_colors(self, img_rgb: np.ndarray):
         """
         Detect unrealistic colors that commonly result from over-correction
@@ -89,21 +153,26 @@ class PostProcessingQualityChecker:
         
         # Detect pixels with excessive red dominance (seuils optimisés et sensibles)
         # Critère optimisé : rouge dominant avec différences détectables
-        red_dominant = (red_channel > 0.45) & (red_channel > green_channel + 0.08) & (red_channel > blue_channel + 0.08)
-        extreme_red_pixels = np.sum(red_dominant) / total_pixels
+        # (criteria are AND-ed in place into a single mask, then counted once)
+        red_dominant = red_channel > 0.45
+        red_dominant &= red_channel > green_channel + 0.08
+        red_dominant &= red_channel > blue_channel + 0.08
+        extreme_red_pixels = np.count_nonzero(red_dominant) / total_pixels
         
         # Check for magenta shift (common Beer-Lambert over-correction artifact)
-        magenta_mask = (red_channel > 0.40) & (blue_channel > 0.25) & (green_channel < 0.30)
-        magenta_pixels = np.sum(magenta_mask) / total_pixels
+        magenta_mask = red_channel > 0.40
+        magenta_mask &= blue_channel > 0.25
+        magenta_mask &= green_channel < 0.30
+        magenta_pixels = np.count_nonzero(magenta_mask) / total_pixels
         
         # Calculate red dominance ratio
         red_dominance_ratio = np.mean(red_channel) / max(np.mean(blue_channel), 0.1)
         
-        # Store results (convert NumPy types to Python types)
+        # Store results
         self.analysis_results['unrealistic_colors'] = {
-            'extreme_red_pixels': float(extreme_red_pixels),
-            'magenta_pixels': float(magenta_pixels),
-            'red_dominance_ratio': float(red_dominance_ratio),
+            'extreme_red_pixels': extreme_red_pixels,
+            'magenta_pixels': magenta_pixels,
+            'red_dominance_ratio': red_dominance_ratio,
             'recommendations': []
         }
         
@@ -134,12 +203,12 @@ class PostProcessingQualityChecker:
         red_vs_blue_ratio = red_mean / max(blue_mean, 0.01)
         
         # Count red-dominant pixels
-        red_dominant_pixels = np.sum(red_channel > np.maximum(green_channel, blue_channel)) / red_channel.size
+        red_dominant_pixels = np.count_nonzero(red_channel > np.maximum(green_channel, blue_channel)) / red_channel.size
         
         self.analysis_results['red_channel_analysis'] = {
-            'red_vs_blue_ratio': float(red_vs_blue_ratio),
-            'red_dominant_pixels': float(red_dominant_pixels),
-            'channel_means': (float(red_mean), float(green_mean), float(blue_mean)),
+            'red_vs_blue_ratio': red_vs_blue_ratio,
+            'red_dominant_pixels': red_dominant_pixels,
+            'channel_means': (red_mean, green_mean, blue_mean),
             'recommendations': []
         }
         
@@ -170,10 +239,10 @@ class PostProcessingQualityChecker:
         mean_saturation = np.mean(saturation)
         
         self.analysis_results['saturation_analysis'] = {
-            'highly_saturated_pixels': float(highly_saturated),
-            'clipped_saturation': float(clipped_saturation),
-            'large_saturated_areas': float(large_saturated_areas),
-            'mean_saturation': float(mean_saturation),
+            'highly_saturated_pixels': highly_saturated,
+            'clipped_saturation': clipped_saturation,
+            'large_saturated_areas': large_saturated_areas,
+            'mean_saturation': mean_saturation,
             'recommendations': []
         }
         
@@ -183,20 +252,16 @@ class PostProcessingQualityChecker:
         if highly_saturated > 0.1:  # More than 10% highly saturated
             self.analysis_results['saturation_analysis']['recommendations'].append('qc_enable_luminance_preserve')
     
-    def _check_color_noise_amplification(self, original_rgb: np.ndarray, processed_rgb: np.ndarray):
+    def _check_color_noise_amplification(self, reference: Dict[str, Any], processed_rgb: np.ndarray,
+                                         same_image: bool = False):
         """
         Detect color noise amplification in low-light areas
         Common issue with aggressive color correction
         """
-        # Convert to float
-        orig_float = original_rgb.astype(np.float32) / 255.0
-        proc_float = processed_rgb.astype(np.float32) / 255.0
+        # Focus on low-light areas of the original, where noise is most problematic
+        low_light_mask = reference['low_light_mask']
         
-        # Focus on low-light areas where noise is most problematic
-        orig_gray = cv2.cvtColor(original_rgb, cv2.COLOR_RGB2GRAY).astype(np.float32) / 255.0
-        low_light_mask = orig_gray < 0.3
-        
-        if np.sum(low_light_mask) == 0:
+        if reference['noise'] is None:
             # No low-light areas to analyze
             self.analysis_results['color_noise_analysis'] = {
                 'red_noise_amplification': 0.0,
@@ -209,27 +274,24 @@ class PostProcessingQualityChecker:
         
         # Calculate noise amplification per channel
         noise_ratios = []
-        
-        for i in range(3):
-            orig_channel = orig_float[:, :, i]
-            proc_channel = proc_float[:, :, i]
-            
-            # Calculate local variance (noise indicator)
-            orig_var = cv2.Laplacian(orig_channel, cv2.CV_32F)
-            proc_var = cv2.Laplacian(proc_channel, cv2.CV_32F)
-            
-            # Focus on low-light areas
-            orig_noise = np.var(orig_var[low_light_mask])
-            proc_noise = np.var(proc_var[low_light_mask])
+        proc_float = None if same_image else processed_rgb.astype(np.float32) / 255.0
+        
+        for i, orig_noise in enumerate(reference['noise']):
+            # Local variance (noise indicator) in low-light areas
+            if same_image:
+                proc_noise = orig_noise
+            else:
+                proc_var = cv2.Laplacian(proc_float[:, :, i], cv2.CV_32F)
+                proc_noise = np.var(proc_var[low_light_mask])
             
             noise_ratio = proc_noise / max(orig_noise, 0.001)
             noise_ratios.append(noise_ratio)
         
         self.analysis_results['color_noise_analysis'] = {
-            'red_noise_amplification': float(noise_ratios[0]),
-            'green_noise_amplification': float(noise_ratios[1]),
-            'blue_noise_amplification': float(noise_ratios[2]),
-            'average_noise_ratio': float(np.mean(noise_ratios)),
+            'red_noise_amplification': noise_ratios[0],
+            'green_noise_amplification': noise_ratios[1],
+            'blue_noise_amplification': noise_ratios[2],
+            'average_noise_ratio': np.mean(noise_ratios),
             'recommendations': []
         }
         
@@ -276,12 +338,12 @@ class PostProcessingQualityChecker:
         
         # Check for overshooting near edges
         edge_regions_mask = dilated_edges > 0
-        edge_intensity_var = np.var(gray[edge_regions_mask]) if np.sum(edge_regions_mask) > 0 else 0
+        edge_intensity_var = np.var(gray[edge_regions_mask]) if np.sum(edge_regions_mask) > 0 else 0.0
         
         self.analysis_results['halo_artifacts'] = {
-            'halo_indicator': float(halo_indicator),
-            'edge_intensity_variance': float(edge_intensity_var),
-            'edge_gradient_ratio': float(edge_gradient_mean / max(overall_gradient_mean, 1)),
+            'halo_indicator': halo_indicator,
+            'edge_intensity_variance': edge_intensity_var,
+            'edge_gradient_ratio': edge_gradient_mean / max(overall_gradient_mean, 1),
             'recommendations': []
         }
         
@@ -314,10 +376,10 @@ class PostProcessingQualityChecker:
         mean_lightness = np.mean(L)
         
         self.analysis_results['midtone_balance'] = {
-            'shadow_ratio': float(shadow_ratio),
-            'midtone_ratio': float(midtone_ratio),
-            'highlight_ratio': float(highlight_ratio),
-            'mean_lightness': float(mean_lightness),
+            'shadow_ratio': shadow_ratio,
+            'midtone_ratio': midtone_ratio,
+            'highlight_ratio': highlight_ratio,
+            'mean_lightness': mean_lightness,
             'shadow_detail_preserved': shadow_detail_preserved,
             'recommendations': []
         }
@@ -328,37 +390,39 @@ class PostProcessingQualityChecker:
         if midtone_ratio < 0.3:  # Too much contrast, not enough midtones
             self.analysis_results['midtone_balance']['recommendations'].append('qc_adjust_contrast_enhancement_precise')
     
-    def _calculate_quality_improvements(self, original: np.ndarray, processed: np.ndarray):
-        """Calculate quantitative quality improvements"""
+    def _calculate_quality_improvements(self, reference: Dict[str, Any], processed: np.ndarray,
+                                        same_image: bool = False):
+        """Calculate quantitative quality improvements against the original features"""
         try:
             # Convert to grayscale for contrast analysis
-            orig_gray = cv2.cvtColor(original, cv2.COLOR_BGR2GRAY)
-            proc_gray = cv2.cvtColor(processed, cv2.COLOR_BGR2GRAY)
+            proc_gray = None if same_image else cv2.cvtColor(processed, cv2.COLOR_BGR2GRAY)
             
             # Calculate contrast (standard deviation of pixel intensities)
-            orig_contrast = np.std(orig_gray)
-            proc_contrast = np.std(proc_gray)
+            orig_contrast = reference['contrast']
+            proc_contrast = orig_contrast if same_image else np.std(proc_gray)
             contrast_improvement = (proc_contrast - orig_contrast) / max(orig_contrast, 1)
             
             # Calculate entropy (measure of information content)
-            orig_entropy = self._calculate_entropy(orig_gray)
-            proc_entropy = self._calculate_entropy(proc_gray)
+            orig_entropy = reference['entropy']
+            proc_entropy = orig_entropy if same_image else self._calculate_entropy(proc_gray)
             entropy_improvement = (proc_entropy - orig_entropy) / max(orig_entropy, 1)
             
-            # Calculate color enhancement (color variance in LAB space)
-            orig_lab = cv2.cvtColor(original, cv2.COLOR_BGR2LAB)
-            proc_lab = cv2.cvtColor(processed, cv2.COLOR_BGR2LAB)
+            # Calculate color enhancement (color variance in LAB space, a* and b* channels)
+            orig_color_var = reference['color_var']
             
-            orig_color_var = np.var(orig_lab[:, :, 1]) + np.var(orig_lab[:, :, 2])  # a* and b* channels
-            proc_color_var = np.var(proc_lab[:, :, 1]) + np.var(proc_lab[:, :, 2])
+            if same_image:
+                proc_color_var = orig_color_var
+            else:
+                proc_lab = cv2.cvtColor(processed, cv2.COLOR_BGR2LAB)
+                proc_color_var = np.var(proc_lab[:, :, 1]) + np.var(proc_lab[:, :, 2])
             color_enhancement = (proc_color_var - orig_color_var) / max(orig_color_var, 1)
             
             self.analysis_results['quality_improvements'] = {
-                'contrast_improvement': float(contrast_improvement),
-                'entropy_improvement': float(entropy_improvement),
-                'color_enhancement': float(color_enhancement),
-                'original_contrast': float(orig_contrast),
-                'processed_contrast': float(proc_contrast),
+                'contrast_improvement': contrast_improvement,
+                'entropy_improvement': entropy_improvement,
+                'color_enhancement': color_enhancement,
+                'original_contrast': orig_contrast,
+                'processed_contrast': proc_contrast,
                 'recommendations': []
             }
             
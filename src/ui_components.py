@@ -3,6 +3,8 @@ UI Components Module
 Contains reusable UI components for the image processing application.
 """
 
+import inspect
+import time
 import tkinter as tk
 from tkinter import ttk
 import numpy as np
@@ -35,30 +37,57 @@ class ParameterPanel(ttk.Frame):
         if hasattr(self, 'update_callback') and self.update_callback:
             self.update_callback()
 
+    @staticmethod
+    def _accepts_scale(callback: Optional[Callable]) -> bool:
+        """Whether a callback can be called with a `scale` keyword argument"""
+        try:
+            parameters = inspect.signature(callback).parameters.values()
+        except (TypeError, ValueError):
+            return False
+        return any(parameter.name == 'scale' or parameter.kind is inspect.Parameter.VAR_KEYWORD
+                   for parameter in parameters)
+
     def update_parameter_visibility(self):
         """Update visibility of parameters based on current settings (stub for compatibility)"""
         # If you have conditional parameters, implement logic here. Otherwise, do nothing.
         pass
 
     def _execute_update(self):
-        """Execute the actual update callback (stub for compatibility)"""
+        """Execute the actual update callback, at draft scale while a slider is dragged
+        
+        The draft scale is only passed to callbacks accepting a `scale` keyword;
+        others get a full update every time.
+        """
         if hasattr(self, 'update_callback') and self.update_callback:
-            self.update_callback()
+            if self._dragging and self._update_takes_scale:
+                self._draft_shown = True
+                self.update_callback(scale=self._draft_scale)
+            else:
+                self._draft_shown = False
+                self.update_callback()
     """Panel for adjusting processing parameters"""
     
     def __init__(self, parent, processor, update_callback: Callable, get_image_callback: Optional[Callable] = None):
         super().__init__(parent)
         self.processor = processor
         self.update_callback = update_callback
+        self._update_takes_scale = self._accepts_scale(update_callback)
         self.get_image_callback = get_image_callback
         self.param_widgets = {}
         self.frame_order = []  # Keep track of frame order for proper re-packing
         self.step_frames = {}  # Store collapsible step frames
         self.step_expanded = {}  # Track expanded/collapsed state
         
-        # Debouncing for smooth slider interaction
+        # Debouncing for smooth slider interaction: one Tk timer per burst of
+        # changes, re-armed on expiry instead of cancelled on every event
         self._update_timer = None
         self._debounce_delay = 150  # milliseconds
+        self._last_change_ns = 0
+        self._dirty = False  # Changes not yet passed to update_callback
+        self._leading = False  # Set on slider press: next change updates at once
+        self._dragging = False  # Between slider press and release
+        self._draft_scale = 0.25  # Preview scale used while dragging
+        self._draft_shown = False  # Last update was a draft: refresh on release
         
         self.setup_ui()
         
@@ -482,6 +511,8 @@ class ParameterPanel(ttk.Frame):
             command=lambda val: self.on_parameter_change(param_name, float(val))
         )
         scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scale.bind("<ButtonPress-1>", self._on_slider_press)
+        scale.bind("<ButtonRelease-1>", self._on_slider_release)
         
         # Value label
         value_label = ttk.Label(frame, text=f"{var.get():.2f}")
@@ -511,6 +542,8 @@ class ParameterPanel(ttk.Frame):
             command=lambda val: self.on_parameter_change(param_name, int(float(val)))
         )
         scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        scale.bind("<ButtonPress-1>", self._on_slider_press)
+        scale.bind("<ButtonRelease-1>", self._on_slider_release)
         
         # Value label
         value_label = ttk.Label(frame, text=str(var.get()))
@@ -577,12 +610,46 @@ class ParameterPanel(ttk.Frame):
     
     def _debounced_update(self):
         """Debounced update to prevent excessive preview refreshes during slider movements"""
-        # Cancel any pending update
-        if self._update_timer is not None:
-            self.after_cancel(self._update_timer)
+        if self._leading:
+            # First change of a drag: refresh right away for instant feedback
+            self._leading = False
+            self._dirty = False
+            self._execute_update()
+            return
         
-        # Schedule new update
-        self._update_timer = self.after(self._debounce_delay, self._execute_update)
+        # Record the change; the pending timer (if any) picks it up on expiry
+        self._dirty = True
+        self._last_change_ns = time.perf_counter_ns()
+        if self._update_timer is None:
+            self._update_timer = self.after(self._debounce_delay, self._flush_update)
+    
+    def _flush_update(self):
+        """Run the update once no change has arrived for the debounce delay"""
+        if not self._dirty:
+            # Already flushed by a slider release
+            self._update_timer = None
+            return
+        quiet_ms = (time.perf_counter_ns() - self._last_change_ns) // 1_000_000
+        if quiet_ms < self._debounce_delay:
+            # Changes arrived since the timer was armed: wait for the remainder
+            self._update_timer = self.after(self._debounce_delay - quiet_ms, self._flush_update)
+            return
+        self._update_timer = None
+        self._dirty = False
+        self._execute_update()
+    
+    def _on_slider_press(self, event=None):
+        """Start of a slider drag: the first change is applied without delay, at draft scale"""
+        self._leading = True
+        self._dragging = True
+    
+    def _on_slider_release(self, event=None):
+        """End of a slider drag: apply the final value at full scale instead of waiting for the timer"""
+        self._leading = False
+        self._dragging = False
+        if self._dirty or self._draft_shown:
+            self._dirty = False
+            self._execute_update()
     
     def toggle_all_auto_tune(self):
         """Exécute l'auto-tune sur toutes les étapes du pipeline (remplace le toggle global)."""
@@ -665,8 +732,7 @@ class ParameterPanel(ttk.Frame):
             optimized_params = self.processor.enhanced_auto_tune_step(original_image, step_key)
             if optimized_params:
                 # Apply optimized parameters
-                for param_name, value in optimized_params.items():
-                    self.processor.set_parameter(param_name, value)
+                self.processor.set_parameters(optimized_params)
                 # Update UI widgets to reflect the new values
                 self.update_ui_from_parameters()
                 # Forcer la mise à jour de l'image affichée
@@ -846,6 +912,9 @@ class InteractivePreviewPanel(ttk.Frame):
         self.rotation = 0.0
         self.split_position = 0.5  # 0.0 = all original, 1.0 = all processed
         
+        # Callbacks notified with the new angle when the rotation changes
+        self._rotation_listeners = []
+        
         # Mouse interaction state
         self.last_mouse_x = 0
         self.last_mouse_y = 0
@@ -937,16 +1006,27 @@ class InteractivePreviewPanel(ttk.Frame):
             self.zoom_factor = 0.1
         self.update_display()
         
+    def on_rotation_change(self, callback: Callable[[float], None]):
+        """Register a callback called with the new angle whenever the rotation changes"""
+        self._rotation_listeners.append(callback)
+        
+    def _set_rotation(self, rotation: float):
+        """Set the rotation angle, notifying listeners only if it actually changed"""
+        rotation = rotation % 360
+        if rotation == self.rotation:
+            return
+        self.rotation = rotation
+        for callback in self._rotation_listeners:
+            callback(rotation)
+        
     def rotate_left(self):
         """Rotate image 90 degrees counter-clockwise"""
-        self.rotation += 90
-        self.rotation = self.rotation % 360
+        self._set_rotation(self.rotation + 90)
         self.update_display()
         
     def rotate_right(self):
         """Rotate image 90 degrees clockwise"""  
-        self.rotation -= 90
-        self.rotation = self.rotation % 360
+        self._set_rotation(self.rotation - 90)
         self.update_display()
         
     def reset_view(self):
@@ -954,7 +1034,7 @@ class InteractivePreviewPanel(ttk.Frame):
         self.zoom_factor = 1.0
         self.pan_x = 0
         self.pan_y = 0
-        self.rotation = 0.0
+        self._set_rotation(0.0)
         self.split_var.set(0.5)
         self.split_position = 0.5
         self.update_display()
@@ -988,7 +1068,7 @@ class InteractivePreviewPanel(ttk.Frame):
         self.zoom_factor = fit_scale
         self.pan_x = 0
         self.pan_y = 0
-        self.rotation = 0.0
+        self._set_rotation(0.0)
         self.update_display()
         
     def fit_to_canvas_with_reset(self):
@@ -1020,7 +1100,7 @@ class InteractivePreviewPanel(ttk.Frame):
         self.zoom_factor = fit_scale
         self.pan_x = 0
         self.pan_y = 0
-        self.rotation = 0.0  # Reset rotation for new images
+        self._set_rotation(0.0)  # Reset rotation for new images
         self.update_display()
         
     def on_mouse_down(self, event):
@@ -0,0 +1,27 @@
+"""
+Comptage des pixels à dominante rouge partagé par les tests de calibration
+
+Les critères historiques sont exprimés sur des canaux normalisés
+(`r > t_r`, `r > g + t_rg`, `r > b + t_rb` avec r, g, b dans [0, 1]).
+Pour des valeurs uint8 ils équivalent à des comparaisons entières
+`R > floor(255 * t)`, évaluées ici sans passer par un tableau float32
+de la taille de l'image.
+"""
+
+import math
+
+import numpy as np
+
+
+def _cutoff(threshold):
+    """Seuil entier équivalent à `valeur / 255 > threshold`"""
+    return math.floor(threshold * 255 + 1e-6)
+
+
+def red_mask_count(img_u8, t_r, t_rg, t_rb):
+    """Nombre de pixels RGB uint8 qui satisfont les trois critères de rouge dominant"""
+    red = img_u8[:, :, 0].astype(np.int16)
+    mask = red > _cutoff(t_r)
+    mask &= (red - img_u8[:, :, 1]) > _cutoff(t_rg)
+    mask &= (red - img_u8[:, :, 2]) > _cutoff(t_rb)
+    return int(np.count_nonzero(mask))
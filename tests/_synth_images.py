@@ -0,0 +1,92 @@
+"""
+Images synthétiques partagées par les tests du système de score
+
+Chaque générateur est mis en cache (clé: hauteur, largeur, graine) et
+retourne un tableau en lecture seule: les appelants qui ont besoin de
+modifier l'image doivent en faire une copie. Aucun test ne peut donc
+modifier l'entrée d'un autre, et les scénarios qui s'en servent restent
+indépendants (compatibles pytest-xdist).
+"""
+
+import functools
+
+import numpy as np
+
+# Graine commune des images synthétiques aléatoires (fixture `rng` comprise)
+RNG_SEED = 42
+
+
+def _splat(img, rng, fraction, colors):
+    """Dépose `fraction` * H * W pixels aléatoires (avec remise) en une seule affectation.
+
+    `colors` est soit une couleur unique, soit une palette dans laquelle
+    chaque pixel tire sa couleur.
+    """
+    height, width = img.shape[:2]
+    count = int(height * width * fraction)
+    ys = rng.integers(0, height, count)
+    xs = rng.integers(0, width, count)
+    colors = np.asarray(colors, dtype=np.uint8)
+    if colors.ndim == 2:
+        colors = colors[rng.integers(0, len(colors), count)]
+    img[ys, xs] = colors
+
+
+def _freeze(img):
+    img.setflags(write=False)
+    return img
+
+
+@functools.lru_cache(maxsize=4)
+def natural(h=200, w=300, seed=0):
+    """Image sous-marine naturelle sans problèmes"""
+    rng = np.random.default_rng(seed)
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    img[:, :] = [35, 55, 85]  # Bleu-vert naturel
+    _splat(img, rng, 0.10, [40, 60, 90])  # Variations légères
+    return _freeze(img)
+
+
+@functools.lru_cache(maxsize=4)
+def moderate_red(h=200, w=300, seed=0):
+    """Image avec problème de rouge modéré (4% de pixels)"""
+    rng = np.random.default_rng(seed)
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    img[:, :] = [25, 40, 70]  # Fond sous-marin
+    _splat(img, rng, 0.04, [120, 25, 30])  # Rouge modéré qui dépasse les seuils
+    return _freeze(img)
+
+
+@functools.lru_cache(maxsize=4)
+def heavy_red(h=200, w=300, seed=0):
+    """Image avec problème de rouge sérieux (10% de pixels)"""
+    rng = np.random.default_rng(seed)
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    img[:, :] = [45, 30, 50]  # Fond avec dominante rouge
+    _splat(img, rng, 0.10, [150, 20, 25])  # Rouge très saturé
+    return _freeze(img)
+
+
+@functools.lru_cache(maxsize=4)
+def underwater_with_red(h=800, w=1200, seed=0):
+    """Image sous-marine avec des problèmes de rouge typiques d'une sur-correction"""
+    rng = np.random.default_rng(seed)
+    img = np.empty((h, w, 3), dtype=np.uint8)
+    img[:, :] = [25, 45, 75]  # Fond bleu-vert sous-marin
+
+    # Éléments naturels (30% des pixels)
+    _splat(img, rng, 0.30, [
+        [35, 60, 85],   # Eau claire
+        [20, 40, 70],   # Eau profonde
+        [50, 70, 90],   # Particules
+        [40, 55, 80],   # Variations
+    ])
+
+    # Rouge artificiel (6% des pixels)
+    _splat(img, rng, 0.06, [
+        [180, 40, 50],  # Rouge saturé
+        [160, 30, 45],  # Rouge modéré
+        [200, 50, 60],  # Rouge intense
+        [170, 35, 40],  # Rouge typique
+    ])
+    return _freeze(img)
@@ -0,0 +1,145 @@
+"""
+Shared pytest fixtures for the Aqualix test suite.
+"""
+
+import importlib
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from src.quality_check import PostProcessingQualityChecker
+from tests._synth_images import RNG_SEED
+
+# Some src/ modules (save_dialog) still import their siblings by bare name
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def language_config(tmp_path_factory):
+    """Language preferences saved by the tests go to a temporary file, not the working directory.
+
+    Both copies of the module are patched: src.localization and the bare
+    `localization` imported by the modules relying on the src/ path entry
+    (unless a test module already replaced the latter by a stand-in).
+    """
+    config_file = tmp_path_factory.mktemp("config") / "aqualix_config.json"
+    modules = [importlib.import_module(name) for name in ("src.localization", "localization")]
+    with ExitStack() as stack:
+        for module in modules:
+            if not hasattr(module, "LocalizationManager"):
+                continue
+            stack.enter_context(patch.object(module.LocalizationManager, "CONFIG_FILE", config_file))
+            stack.enter_context(patch.object(module.get_localization_manager(), "config_file", config_file))
+        yield config_file
+
+
+@pytest.fixture
+def rng():
+    """Fresh PCG64 generator per test so image content does not depend on test order."""
+    return np.random.default_rng(RNG_SEED)
+
+
+@pytest.fixture(scope="session")
+def checker():
+    """Single quality checker shared by the scoring tests (run_all_checks resets its state)."""
+    return PostProcessingQualityChecker()
+
+
+@pytest.fixture(scope="session")
+def processor():
+    """Single ImageProcessor, warmed up once so OpenCV's lazy init is not billed to the first test."""
+    from src.image_processing import ImageProcessor
+    p = ImageProcessor()
+    p.process_image(np.zeros((8, 8, 3), dtype=np.uint8))
+    return p
+
+
+@pytest.fixture
+def minimal_app(processor):
+    """Cheap stand-in for ImageVideoProcessorApp when only the save path is under test.
+
+    Every attribute is a MagicMock stub except the image state and the real
+    save_result / save_image / get_full_resolution_processed_image methods,
+    bound to the mock so the code under test still runs. Needs no display.
+    """
+    from src.main import ImageVideoProcessorApp
+    app = MagicMock()
+    app.processor = processor
+    app.original_image = None
+    app.processed_image = None
+    app.current_file = None
+    app.video_capture = None
+    app.preview_scale_factor = 1.0
+    for name in ("save_result", "save_image", "get_full_resolution_processed_image"):
+        setattr(app, name, getattr(ImageVideoProcessorApp, name).__get__(app))
+    return app
+
+
+@pytest.fixture
+def mocked_save_env():
+    """ExitStack with file writing and the success popup patched out.
+
+    Tests push their own patches (save dialog, progress bar) onto the
+    returned stack; everything is undone at teardown.
+    """
+    import cv2
+    from tkinter import messagebox
+    with ExitStack() as stack:
+        stack.enter_context(patch.object(cv2, 'imwrite', return_value=True))
+        stack.enter_context(patch.object(messagebox, 'showinfo'))
+        yield stack
+
+
+@pytest.fixture(scope="session")
+def tk_root():
+    """Hidden Tk root shared by every UI test; skips when no display is available."""
+    tk = pytest.importorskip("tkinter")
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"Tk display not available: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+class SharedApp:
+    """Session-wide ImageVideoProcessorApp, reset between tests via `load()`."""
+
+    def __init__(self, app):
+        self.app = app
+        self.language = app.localization_manager.get_language()
+
+    def load(self, image, current_file=None):
+        """Set a new original image on the app and drop every derived image"""
+        self.app.original_image = image
+        self.app.current_file = current_file
+        self.invalidate()
+
+    def invalidate(self):
+        self.app.processed_image = None
+        self.app.original_preview = None
+        self.app.processed_preview = None
+
+
+@pytest.fixture(scope="session")
+def tk_app(tk_root):
+    """Single application instance built once for the whole session."""
+    from src.main import ImageVideoProcessorApp
+    return SharedApp(ImageVideoProcessorApp(tk_root))
+
+
+@pytest.fixture
+def app(tk_app):
+    """The shared application, reset to an image-less state on its first tab."""
+    tk_app.load(None)
+    app = tk_app.app
+    app.notebook.select(0)
+    if app.localization_manager.get_language() != tk_app.language:
+        app.localization_manager.set_language(tk_app.language)
+        app.refresh_ui()
+    return app
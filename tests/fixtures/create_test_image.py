@@ -34,7 +34,7 @@ def create_simple_test_image():
     cv2.ellipse(image, (150, 220), (20, 10), -30, 0, 360, (100, 140, 160), -1)
     
     # Add some texture/noise to make it more realistic
-    noise = np.random.randint(-10, 10, (height, width, 3))
+    noise = np.random.default_rng().integers(-10, 10, (height, width, 3), dtype=np.int16)
     image = np.clip(image.astype(np.int16) + noise, 0, 255).astype(np.uint8)
     
     return image
@@ -13,23 +13,16 @@ def create_test_underwater_image():
     # Create a base image with underwater characteristics
     height, width = 400, 600
     
-    # Create gradient from blue-green (top) to darker blue (bottom)
-    img = np.zeros((height, width, 3), dtype=np.uint8)
+    # Create gradient from blue-green (top) to darker blue (bottom):
+    # simulate depth-based color loss, one depth factor per row
+    depth_factor = np.arange(height)[:, None] / height
     
-    for y in range(height):
-        # Simulate depth-based color loss
-        depth_factor = y / height
-        
-        # Blue channel (less affected by depth)
-        blue_val = int(120 - depth_factor * 40)
-        
-        # Green channel (moderate loss)
-        green_val = int(100 - depth_factor * 60)
-        
-        # Red channel (strong loss with depth)
-        red_val = int(80 - depth_factor * 70)
-        
-        img[y, :] = [max(0, blue_val), max(0, green_val), max(0, red_val)]
+    blue = np.clip(120 - depth_factor * 40, 0, 255)   # Less affected by depth
+    green = np.clip(100 - depth_factor * 60, 0, 255)  # Moderate loss
+    red = np.clip(80 - depth_factor * 70, 0, 255)     # Strong loss with depth
+    
+    column = np.stack([blue, green, red], axis=-1).astype(np.uint8)
+    img = np.ascontiguousarray(np.broadcast_to(column, (height, width, 3)))
     
     # Add some objects/details
     cv2.circle(img, (150, 100), 30, (60, 80, 40), -1)  # Dark object
@@ -90,8 +83,9 @@ def main():
     test_image = create_test_underwater_image()
     
     print(f"📸 Created synthetic underwater image: {test_image.shape}")
-    print(f"   Color characteristics: R={np.mean(test_image[:,:,2]):.1f}, "
-          f"G={np.mean(test_image[:,:,1]):.1f}, B={np.mean(test_image[:,:,0]):.1f}")
+    # All channel means in one pass (BGR order)
+    b_mean, g_mean, r_mean = test_image.reshape(-1, 3).mean(axis=0)
+    print(f"   Color characteristics: R={r_mean:.1f}, G={g_mean:.1f}, B={b_mean:.1f}")
     
     # Test each auto-tune step
     steps_to_test = [
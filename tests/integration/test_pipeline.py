@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test du cache des étapes du pipeline
+Vérifie que la preview ne ré-exécute que les étapes dont les paramètres
+(ou ceux d'une étape précédente) ont changé
+"""
+
+import sys
+sys.path.insert(0, '.')
+
+from unittest.mock import patch
+
+import numpy as np
+
+from src.image_processing import ImageProcessor
+
+
+def _count_stage_calls(processor, image, stage_methods, process=None):
+    """Traite l'image (preview par défaut) en comptant les appels à chaque méthode d'étape"""
+    if process is None:
+        process = lambda img: processor.process_image_for_preview(img)[1]
+    calls = dict.fromkeys(stage_methods, 0)
+    patches = []
+    for name in stage_methods:
+        method = getattr(processor, name)
+
+        def counted(*args, _name=name, _method=method):
+            calls[_name] += 1
+            return _method(*args)
+
+        patches.append(patch.object(processor, name, counted))
+
+    for p in patches:
+        p.start()
+    try:
+        result = process(image)
+    finally:
+        for p in patches:
+            p.stop()
+    return result, calls
+
+
+def test_stage_cache_reruns_changed_stages_only():
+    """Seules les étapes à partir du premier paramètre modifié sont recalculées"""
+    processor = ImageProcessor()
+    image = np.random.default_rng(0).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    stage_methods = ['apply_white_balance', 'adaptive_histogram_equalization', 'multiscale_fusion']
+
+    first, calls = _count_stage_calls(processor, image, stage_methods)
+    assert calls == dict.fromkeys(stage_methods, 1)
+
+    # Mêmes paramètres, même image (copie): tout vient du cache
+    again, calls = _count_stage_calls(processor, image.copy(), stage_methods)
+    assert calls == dict.fromkeys(stage_methods, 0)
+    assert np.array_equal(first, again)
+
+    # Paramètre de l'égalisation: balance des blancs conservée, la suite recalculée
+    processor.set_parameter('hist_eq_clip_limit', 3.0)
+    changed, calls = _count_stage_calls(processor, image, stage_methods)
+    assert calls == {'apply_white_balance': 0, 'adaptive_histogram_equalization': 1, 'multiscale_fusion': 1}
+
+    # Résultat identique à un traitement sans cache
+    assert np.array_equal(changed, processor.process_image(image))
+
+
+def test_stage_cache_returns_private_copy():
+    """Modifier le résultat retourné n'altère pas le cache"""
+    processor = ImageProcessor()
+    image = np.random.default_rng(1).integers(0, 255, (32, 32, 3), dtype=np.uint8)
+
+    _, result, _ = processor.process_image_for_preview(image)
+    expected = result.copy()
+    result[:] = 0
+
+    assert np.array_equal(processor.process_image_for_preview(image)[1], expected)
+
+
+def test_stage_cache_limited_to_previews():
+    """process_image (sauvegarde, vidéo) et les brouillons ne touchent pas au cache"""
+    processor = ImageProcessor()
+    image = np.random.default_rng(4).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+    stage_methods = ['apply_white_balance', 'multiscale_fusion']
+
+    processor.process_image(image)
+    assert not processor._stage_cache
+
+    processor.process_image_for_preview(image)
+    cached = dict(processor._stage_cache)
+
+    # Un brouillon pendant le glissement n'évince pas les étapes pleine échelle
+    processor.process_image_for_preview(image, scale=0.25)
+    assert processor._stage_cache == cached
+    _, calls = _count_stage_calls(processor, image, stage_methods)
+    assert calls == dict.fromkeys(stage_methods, 0)
+
+    # Nouvelle image chargée
+    processor.clear_stage_cache()
+    assert not processor._stage_cache
+
+
+def test_stage_cache_pixel_budget():
+    """Au-delà du budget de pixels, la preview n'est pas mise en cache"""
+    processor = ImageProcessor()
+    image = np.random.default_rng(5).integers(0, 255, (64, 64, 3), dtype=np.uint8)
+
+    with patch.object(ImageProcessor, 'STAGE_CACHE_MAX_PIXELS', 64 * 64 - 1):
+        processor.process_image_for_preview(image)
+    assert not processor._stage_cache
+
+
+def test_every_parameter_belongs_to_a_stage():
+    """Chaque paramètre invalide les sorties mises en cache de son étape"""
+    processor = ImageProcessor()
+    mapped = [name for names in processor._stage_parameter_names.values() for name in names]
+    assert sorted(mapped) == sorted(processor.parameters)
+
+
+def test_all_disabled_returns_input():
+    """Sans étape activée, l'image d'entrée est retournée telle quelle"""
+    processor = ImageProcessor()
+    processor.set_parameters({flag: False for flag in (
+        'white_balance_enabled', 'udcp_enabled', 'beer_lambert_enabled',
+        'color_rebalance_enabled', 'hist_eq_enabled', 'multiscale_fusion_enabled')})
+    image = np.random.default_rng(3).integers(0, 255, (16, 16, 3), dtype=np.uint8)
+
+    assert processor.process_image(image) is image
+
+
+def test_max_dim_caps_processed_resolution():
+    """max_dim limite la taille traitée; le résultat garde la taille d'entrée"""
+    processor = ImageProcessor()
+    image = np.random.default_rng(2).integers(0, 255, (120, 200, 3), dtype=np.uint8)
+
+    with patch.object(processor, 'apply_white_balance', wraps=processor.apply_white_balance) as spy:
+        result = processor.process_image(image, max_dim=50)
+    assert spy.call_args[0][0].shape[:2] == (30, 50)
+    assert result.shape == image.shape
+
+    # Image déjà plus petite que max_dim: traitement à pleine résolution
+    assert np.array_equal(processor.process_image(image, max_dim=400), processor.process_image(image))
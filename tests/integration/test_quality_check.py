@@ -57,7 +57,7 @@ def simulate_processed_image(original):
     
     return processed
 
-def test_quality_system():
+def test_quality_system(tmp_path):
     """Test the quality check system"""
     try:
         # Import quality checker
@@ -69,7 +69,7 @@ def test_quality_system():
         processed = simulate_processed_image(original)
         
         # Save test images for visualization
-        test_dir = Path("test_images")
+        test_dir = tmp_path
         test_dir.mkdir(exist_ok=True)
         
         cv2.imwrite(str(test_dir / "test_original.jpg"), original)
@@ -142,4 +142,4 @@ def test_quality_system():
         traceback.print_exc()
 
 if __name__ == "__main__":
-    test_quality_system()
+    test_quality_system(Path("test_images"))
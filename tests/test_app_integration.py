@@ -6,28 +6,24 @@ Utilise l'application complète pour vérifier les corrections
 import sys
 sys.path.insert(0, '.')
 
-import numpy as np
 import cv2
 import os
 import tempfile
-from src.main import ImageVideoProcessorApp
 from src.quality_check import PostProcessingQualityChecker
-import tkinter as tk
+from tests._synth_images import underwater_with_red
 
-def test_app_integration():
+def test_app_integration(tk_app):
     """Test le système de score avec l'application complète"""
     print("🎯 TEST INTÉGRATION COMPLÈTE - SYSTÈME DE SCORE")
     print("=" * 60)
     
-    # Créer une application
-    root = tk.Tk()
-    root.withdraw()
-    app = ImageVideoProcessorApp(root)
+    # Application partagée pour toute la session
+    app = tk_app.app
     
     # Créer une image test sous-marine avec des problèmes de rouge
     print("\n📸 CRÉATION D'UNE IMAGE TEST SOUS-MARINE")
     height, width = 800, 1200
-    img_test = create_underwater_image_with_red_issues(height, width)
+    img_test = underwater_with_red(height, width)
     
     # Sauvegarder temporairement
     with tempfile.NamedTemporaryFile(suffix='.jpg', delete=False) as tmp:
@@ -38,8 +34,7 @@ def test_app_integration():
         # Charger l'image dans l'app
         img_bgr = cv2.imread(temp_path)
         if img_bgr is not None:
-            app.original_image = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB)
-            app.current_file = temp_path
+            tk_app.load(cv2.cvtColor(img_bgr, cv2.COLOR_BGR2RGB), temp_path)
             print(f"   Image chargée: {app.original_image.shape}")
         else:
             raise ValueError("Impossible de charger l'image test")
@@ -104,41 +99,7 @@ def test_app_integration():
     finally:
         # Nettoyage
         os.unlink(temp_path)
-        root.destroy()
-
-def create_underwater_image_with_red_issues(height, width):
-    """Crée une image sous-marine avec des problèmes de rouge typiques"""
-    # Base: couleurs sous-marines naturelles
-    img = np.zeros((height, width, 3), dtype=np.uint8)
-    img[:, :] = [25, 45, 75]  # Fond bleu-vert sous-marin
-    
-    # Ajouter des éléments naturels
-    natural_pixels = int(height * width * 0.3)
-    for _ in range(natural_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        # Couleurs sous-marines naturelles
-        colors = [
-            [35, 60, 85],   # Eau claire
-            [20, 40, 70],   # Eau profonde  
-            [50, 70, 90],   # Particules
-            [40, 55, 80],   # Variations
-        ]
-        img[y, x] = colors[np.random.randint(0, len(colors))]
-    
-    # Ajouter des problèmes de rouge typiques (sur-correction)
-    red_problem_pixels = int(height * width * 0.06)  # 6% de pixels problématiques
-    for _ in range(red_problem_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        # Rouge artificiel typique des sur-corrections
-        red_colors = [
-            [180, 40, 50],  # Rouge saturé
-            [160, 30, 45],  # Rouge modéré
-            [200, 50, 60],  # Rouge intense
-            [170, 35, 40],  # Rouge typical
-        ]
-        img[y, x] = red_colors[np.random.randint(0, len(red_colors))]
-    
-    return img
 
 if __name__ == "__main__":
-    test_app_integration()
+    import pytest
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -1,91 +1,93 @@
 """
 Test final du système de score corrigé avec cas réalistes
+
+Chaque cas est un scénario paramétré indépendant;
+le test final compare les scores des deux cas.
 """
 
 import sys
 sys.path.insert(0, '.')
 
-from src.quality_check import PostProcessingQualityChecker
+import functools
+
 import numpy as np
 import cv2
+import pytest
 
-def test_corrected_scoring_system():
-    """Test final du système de score avec cas qui devraient fonctionner"""
-    print("🎯 TEST FINAL - SYSTÈME DE SCORE CORRIGÉ")
-    print("=" * 60)
-    
-    height, width = 400, 600
-    
-    # CAS 1: Image naturelle bien équilibrée (DOIT avoir un BON score)
-    print("\n📊 CAS 1: Image naturelle équilibrée")
-    img_good = np.zeros((height, width, 3), dtype=np.uint8)
+from tests._synth_images import RNG_SEED
+
+HEIGHT, WIDTH = 400, 600
+
+
+def build_good_image():
+    """CAS 1: Image naturelle bien équilibrée (DOIT avoir un BON score)"""
+    img_good = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
     img_good[:, :] = [45, 65, 85]  # Couleurs naturelles équilibrées
     # Ajouter quelques éléments colorés naturels
-    natural_pixels = int(height * width * 0.02)
-    for _ in range(natural_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        img_good[y, x] = [120, 80, 60]  # Couleur naturelle
-    
-    img_good_rgb = cv2.cvtColor(img_good, cv2.COLOR_BGR2RGB)
-    
-    # CAS 2: Image avec balance rouge excessive (DOIT avoir un MAUVAIS score)
-    print("\n📊 CAS 2: Balance rouge excessive")
-    img_bad = np.zeros((height, width, 3), dtype=np.uint8)
+    rng = np.random.default_rng(RNG_SEED)
+    natural_pixels = int(HEIGHT * WIDTH * 0.02)
+    ys = rng.integers(0, HEIGHT, natural_pixels)
+    xs = rng.integers(0, WIDTH, natural_pixels)
+    img_good[ys, xs] = [120, 80, 60]  # Couleur naturelle
+    return cv2.cvtColor(img_good, cv2.COLOR_BGR2RGB)
+
+
+def build_bad_image():
+    """CAS 2: Image avec balance rouge excessive (DOIT avoir un MAUVAIS score)"""
+    img_bad = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
     img_bad[:, :] = [60, 35, 45]  # Fond avec dominante rouge
     # Ajouter des pixels rouge saturé (8% - basé sur scénario 2 qui fonctionne)
-    red_pixels = int(height * width * 0.08)
-    for _ in range(red_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        img_bad[y, x] = [200, 40, 50]  # Rouge saturé
-    
-    img_bad_rgb = cv2.cvtColor(img_bad, cv2.COLOR_BGR2RGB)
-    
-    # Analyser avec le système corrigé
-    checker = PostProcessingQualityChecker()
-    
-    # Test image "bonne"
-    results_good = checker.run_all_checks(img_good_rgb, img_good_rgb)
-    score_good = checker._calculate_overall_score(results_good)
-    
-    # Test image "mauvaise"  
-    results_bad = checker.run_all_checks(img_bad_rgb, img_bad_rgb)
-    score_bad = checker._calculate_overall_score(results_bad)
-    
+    rng = np.random.default_rng(RNG_SEED)
+    red_pixels = int(HEIGHT * WIDTH * 0.08)
+    ys = rng.integers(0, HEIGHT, red_pixels)
+    xs = rng.integers(0, WIDTH, red_pixels)
+    img_bad[ys, xs] = [200, 40, 50]  # Rouge saturé
+    return cv2.cvtColor(img_bad, cv2.COLOR_BGR2RGB)
+
+
+@functools.lru_cache(maxsize=None)
+def _analyse(checker, builder):
+    """Analyse un cas avec le système corrigé (mémorisée par processus)"""
+    img = builder()
+    results = checker.run_all_checks(img, img)
+    return results, checker._calculate_overall_score(results)
+
+
+@pytest.mark.parametrize("builder", [build_good_image, build_bad_image],
+                         ids=["naturelle", "rouge_excessif"])
+def test_scoring_scenario(builder, checker):
+    """Détails de détection pour un cas"""
+    results, score = _analyse(checker, builder)
+    red_data = results.get('unrealistic_colors', {})
+
+    print(f"\n🔬 {builder.__doc__}")
+    print(f"      Score: {score:.2f}/10")
+    print(f"      Pixels rouges extrêmes: {red_data.get('extreme_red_pixels', 0)*100:.2f}%")
+    print(f"      Pixels magenta: {red_data.get('magenta_pixels', 0)*100:.2f}%")
+
+    assert 'error' not in results
+    assert 0 <= score <= 10
+
+
+def test_corrected_scoring_system(checker):
+    """Test final du système de score avec cas qui devraient fonctionner"""
+    print("🎯 TEST FINAL - SYSTÈME DE SCORE CORRIGÉ")
+    print("=" * 60)
+
+    _, score_good = _analyse(checker, build_good_image)
+    _, score_bad = _analyse(checker, build_bad_image)
+
     print(f"\n📈 SCORES FINAUX:")
     print(f"   Image naturelle équilibrée:  {score_good:.2f}/10")
     print(f"   Image balance rouge excessive: {score_bad:.2f}/10")
     print(f"   Différence: {score_good - score_bad:.2f} points")
-    print()
-    
-    # Analyser les détails
-    print("🔬 DÉTAILS DE DÉTECTION:")
-    print("\n   Image naturelle:")
-    red_data_good = results_good.get('unrealistic_colors', {})
-    print(f"      Pixels rouges extrêmes: {red_data_good.get('extreme_red_pixels', 0)*100:.2f}%")
-    print(f"      Pixels magenta: {red_data_good.get('magenta_pixels', 0)*100:.2f}%")
-    
-    print("\n   Image balance rouge excessive:")
-    red_data_bad = results_bad.get('unrealistic_colors', {})
-    print(f"      Pixels rouges extrêmes: {red_data_bad.get('extreme_red_pixels', 0)*100:.2f}%")
-    print(f"      Pixels magenta: {red_data_bad.get('magenta_pixels', 0)*100:.2f}%")
-    
-    # Résultat final
-    print(f"\n✅ RÉSULTAT:")
-    if score_good > score_bad and (score_good - score_bad) >= 0.5:
-        print(f"   🎉 SUCCÈS! Le système fonctionne correctement:")
-        print(f"      - Image naturelle: score élevé ({score_good:.1f})")
-        print(f"      - Image problématique: score plus bas ({score_bad:.1f})")
-        print(f"      - Différence significative: {score_good - score_bad:.1f} points")
-        return True
-    elif score_good > score_bad:
+
+    if score_good > score_bad and (score_good - score_bad) < 0.5:
         print(f"   ⚠️ AMÉLIORATION: Le système fonctionne mais la différence est faible")
-        print(f"      - Différence: seulement {score_good - score_bad:.1f} points")
         print(f"      - Les seuils pourraient être affinés")
-        return True
-    else:
-        print(f"   ❌ PROBLÈME: Le système ne fonctionne toujours pas correctement")
-        print(f"      - Image problématique a un meilleur score!")
-        return False
+
+    assert score_good > score_bad, "L'image problématique a un meilleur score!"
+
 
 if __name__ == "__main__":
-    test_corrected_scoring_system()
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -4,130 +4,60 @@ Test de validation finale - Correction du problème de score inchangé
 Fix: Le score ne changeait pas même après modification des paramètres
 """
 
-import os
-import sys
-import traceback
+from pathlib import Path
 
-def test_final_parameter_sync():
+import numpy as np
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+def test_final_parameter_sync(tk_app, rng):
     """Test final de la synchronisation des paramètres pour l'analyse"""
+    import tkinter as tk
+    from src.quality_control_tab import QualityControlTab
+    from src.localization import LocalizationManager
+
     print("\n" + "="*60)
     print("🔧 VALIDATION FINALE - SYNCHRONISATION PARAMÈTRES")
     print("="*60)
-    
-    tests_passed = 0
-    total_tests = 6
-    
+
+    # Test 1: Vérification du code de synchronisation
+    print("\n1. Test présence du code de synchronisation...")
+    content = (SRC_DIR / "quality_control_tab.py").read_text(encoding="utf-8")
+    assert 'self.app.processed_image = None' in content
+    assert 'self.app.processed_preview = None' in content
+    assert 'self.app.update_preview()' in content
+    print("   ✅ Code de synchronisation complet présent")
+
+    # Test 2: Application partagée de la session avec une nouvelle image
+    print("\n2. Test application complète...")
+    app = tk_app.app
+    tk_app.load(rng.integers(0, 255, (50, 50, 3), dtype=np.uint8), 'test.jpg')
+    assert hasattr(app, 'update_preview')
+    print("   ✅ Application prête avec UI")
+
+    # Test 3: Création QualityControlTab, détachée de la racine à la fin
+    print("\n3. Test création QualityControlTab...")
+    tab_frame = tk.Frame(app.root)
     try:
-        # Test 1: Import et fonctionnalité de base
-        print("\n1. Test import et setup...")
-        from src.quality_control_tab import QualityControlTab
-        from src.main import ImageVideoProcessorApp
-        import tkinter as tk
-        from src.localization import LocalizationManager
-        import numpy as np
-        print("   ✅ Imports réussis")
-        tests_passed += 1
-        
-        # Test 2: Vérification du code de synchronisation
-        print("\n2. Test présence du code de synchronisation...")
-        with open('src/quality_control_tab.py', 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        has_cache_clear = 'self.app.processed_image = None' in content
-        has_preview_clear = 'self.app.processed_preview = None' in content
-        has_update_preview = 'self.app.update_preview()' in content
-        
-        if has_cache_clear and has_preview_clear and has_update_preview:
-            print("   ✅ Code de synchronisation complet présent")
-            tests_passed += 1
-        else:
-            print(f"   ❌ Code manquant - cache: {has_cache_clear}, preview: {has_preview_clear}, update: {has_update_preview}")
-        
-        # Test 3: Création de l'application avec UI
-        print("\n3. Test création application complète...")
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ImageVideoProcessorApp(root)
-        loc = LocalizationManager()
-        
-        # Image test
-        app.original_image = np.random.randint(0, 255, (50, 50, 3), dtype=np.uint8)
-        app.current_file = 'test.jpg'
-        
-        print("   ✅ Application créée avec UI")
-        tests_passed += 1
-        
-        # Test 4: Vérification méthode update_preview
-        print("\n4. Test disponibilité update_preview...")
-        has_update_method = hasattr(app, 'update_preview')
-        if has_update_method:
-            print("   ✅ Méthode update_preview disponible")
-            tests_passed += 1
-        else:
-            print("   ❌ Méthode update_preview manquante")
-        
-        # Test 5: Création QualityControlTab
-        print("\n5. Test création QualityControlTab...")
-        tab_frame = tk.Frame(root)
-        tab = QualityControlTab(tab_frame, app, loc)
-        
+        QualityControlTab(tab_frame, app, LocalizationManager())
         print("   ✅ QualityControlTab créé avec succès")
-        tests_passed += 1
-        
-        # Test 6: Simulation du processus d'analyse
-        print("\n6. Test simulation analyse avec synchronisation...")
-        try:
-            # Simuler les étapes de la correction
-            app.processed_image = None
-            app.processed_preview = None
-            
-            # Test si update_preview peut être appelé
-            if has_update_method:
-                # Ne pas vraiment l'appeler car cela nécessite une image valide
-                # mais vérifier que c'est possible
-                print("   ✅ Synchronisation preview disponible")
-            else:
-                print("   ⚠️  Pas de synchronisation preview")
-                
-            # Test retraitement
-            try:
-                new_processed = app.get_full_resolution_processed_image()
-                success = new_processed is not None
-                print(f"   ✅ Retraitement: {'réussi' if success else 'échoué'}")
-            except Exception as e:
-                print(f"   ⚠️  Retraitement avec erreur mineure: {str(e)[:30]}...")
-            
-            tests_passed += 1
-            
-        except Exception as e:
-            print(f"   ❌ Erreur simulation: {e}")
-        
-        root.destroy()
-        
-    except Exception as e:
-        print(f"   ❌ Erreur pendant les tests: {e}")
-        traceback.print_exc()
-    
-    # Résultats
-    print("\n" + "="*60)
-    print(f"🎯 RÉSULTATS CORRECTION FINALE")
-    print(f"   Tests réussis: {tests_passed}/{total_tests}")
-    print(f"   Pourcentage de réussite: {(tests_passed/total_tests)*100:.1f}%")
-    
-    if tests_passed == total_tests:
-        print("\n🎊 CORRECTION FINALE RÉUSSIE!")
-        print("   ✅ Invalidation du cache implémentée")
-        print("   ✅ Synchronisation preview forcée")  
-        print("   ✅ Retraitement avec paramètres actuels")
-        print("   ✅ Le score changera avec les modifications")
-        return True
-    else:
-        print(f"\n⚠️  CORRECTION PARTIELLE ({tests_passed}/{total_tests})")
-        return False
+
+        # Test 4: Simulation du processus d'analyse
+        print("\n4. Test retraitement après invalidation...")
+        tk_app.invalidate()
+        assert app.processed_image is None
+        new_processed = app.get_full_resolution_processed_image()
+        assert new_processed is not None
+        assert new_processed.shape == app.original_image.shape
+        print("   ✅ Retraitement réussi")
+    finally:
+        tab_frame.destroy()
+
+    print("\n🎊 CORRECTION FINALE RÉUSSIE!")
 
 if __name__ == "__main__":
-    success = test_final_parameter_sync()
+    import pytest
+    success = pytest.main([__file__, "-v"]) == 0
     if success:
         print("\n🚀 SOLUTION FINALE:")
         print("   1. Chargez une image")
@@ -18,182 +18,142 @@ Date: 13 Août 2025
 
 import sys
 import os
+import re
 from pathlib import Path
+from types import SimpleNamespace
 
-# Add src directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import pytest
 
-def test_language_change_fix():
+sys.path.insert(0, '.')
+
+# Seuls les tests d'interface dépendent de Tk: test_old_button_removed
+# doit pouvoir tourner sur une machine sans affichage ni tkinter.
+try:
+    import tkinter.messagebox
+    from tkinter import ttk
+    from src.quality_control_tab import QualityControlTab
+    from src.localization import LocalizationManager
+except ImportError as e:
+    _TK_IMPORT_ERROR = e
+else:
+    _TK_IMPORT_ERROR = None
+
+
+@pytest.fixture(scope="module")
+def tk_modules():
+    """Saute le test si les modules d'interface ne sont pas importables"""
+    if _TK_IMPORT_ERROR is not None:
+        pytest.skip(f"Interface Tk indisponible: {_TK_IMPORT_ERROR}")
+
+# Source de main.py lu une seule fois pour les vérifications par motif
+_MAIN_SRC = (Path(__file__).parent.parent / "src" / "main.py").read_text(encoding="utf-8")
+
+_OLD_BUTTON_PATTERNS = (
+    "ttk.Button(toolbar, text=t('quality_check')",
+    "command=self.show_quality_tab).pack(side=tk.RIGHT, padx=(0, 5))",
+)
+_OLD_METHOD = "def run_quality_check(self):"
+_SHOW_TAB_METHOD = "def show_quality_tab(self):"
+_MAIN_PATTERNS = re.compile("|".join(
+    re.escape(p) for p in (*_OLD_BUTTON_PATTERNS, _OLD_METHOD, _SHOW_TAB_METHOD)))
+
+
+@pytest.mark.usefixtures("tk_modules")
+def test_language_change_fix(app, language_config):
     """Test que l'onglet qualité persiste après changement de langue"""
     
     print("🌍 1. TEST CORRECTION CHANGEMENT LANGUE")
     print("-" * 45)
     
-    try:
-        import tkinter as tk
-        from tkinter import ttk
-        from main import ImageVideoProcessorApp
-        from localization import LocalizationManager
-        
-        # Create test app (hidden)
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ImageVideoProcessorApp(root)
-        
-        # Verify initial state - 5 tabs expected
-        initial_tab_count = app.notebook.index("end")
-        print(f"   Nombre d'onglets initial: {initial_tab_count}")
-        
-        if initial_tab_count != 5:
-            print(f"   ❌ Attendu 5 onglets, trouvé {initial_tab_count}")
-            return False
-        
-        # Check tab 3 is quality control (index 3)
-        tab3_text = app.notebook.tab(3, 'text')
-        print(f"   Onglet 3 (qualité): '{tab3_text}'")
-        
-        # Change language to French
-        app.localization_manager.set_language('fr')
-        app.refresh_ui()
-        
-        # Verify tabs still exist after language change
-        after_tab_count = app.notebook.index("end")
-        print(f"   Nombre d'onglets après changement langue: {after_tab_count}")
-        
-        # Check quality tab still exists at position 3
-        tab3_text_fr = app.notebook.tab(3, 'text')
-        print(f"   Onglet 3 après changement: '{tab3_text_fr}'")
-        
-        # Change back to English
-        app.localization_manager.set_language('en')
-        app.refresh_ui()
-        
-        final_tab_count = app.notebook.index("end")
-        tab3_text_en = app.notebook.tab(3, 'text')
-        
-        print(f"   Nombre d'onglets final: {final_tab_count}")
-        print(f"   Onglet 3 final: '{tab3_text_en}'")
-        
-        # Test refresh_ui method exists in QualityControlTab
-        has_refresh_method = hasattr(app.quality_panel, 'refresh_ui')
-        print(f"   QualityControlTab.refresh_ui() existe: {has_refresh_method}")
-        
-        root.destroy()
-        
-        success = (initial_tab_count == after_tab_count == final_tab_count == 5 and has_refresh_method)
-        
-        if success:
-            print("   ✅ CORRECTION CHANGEMENT LANGUE: VALIDÉE")
-        else:
-            print("   ❌ CORRECTION CHANGEMENT LANGUE: ÉCHEC")
-            
-        return success
-        
-    except Exception as e:
-        print(f"   ❌ Erreur test changement langue: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Préférence de langue écrite dans le fichier temporaire de la session
+    loc = app.localization_manager
+    assert loc.config_file == language_config
+    initial_language = loc.get_language()
+    
+    # Verify initial state - 5 tabs expected
+    initial_tab_count = app.notebook.index("end")
+    print(f"   Nombre d'onglets initial: {initial_tab_count}")
+    
+    assert initial_tab_count == 5, f"Attendu 5 onglets, trouvé {initial_tab_count}"
+    
+    # Check tab 3 is quality control (index 3)
+    tab3_text = app.notebook.tab(3, 'text')
+    print(f"   Onglet 3 (qualité): '{tab3_text}'")
+    
+    # Change language to French
+    app.localization_manager.set_language('fr')
+    app.refresh_ui()
+    
+    # Verify tabs still exist after language change
+    after_tab_count = app.notebook.index("end")
+    print(f"   Nombre d'onglets après changement langue: {after_tab_count}")
+    
+    # Check quality tab still exists at position 3
+    tab3_text_fr = app.notebook.tab(3, 'text')
+    print(f"   Onglet 3 après changement: '{tab3_text_fr}'")
+    
+    # Change back to English
+    app.localization_manager.set_language('en')
+    app.refresh_ui()
+    
+    final_tab_count = app.notebook.index("end")
+    tab3_text_en = app.notebook.tab(3, 'text')
+    
+    # Langue initiale restaurée pour les tests suivants
+    loc.set_language(initial_language)
+    app.refresh_ui()
+    
+    print(f"   Nombre d'onglets final: {final_tab_count}")
+    print(f"   Onglet 3 final: '{tab3_text_en}'")
+    
+    # Test refresh_ui method exists in QualityControlTab
+    has_refresh_method = hasattr(app.quality_panel, 'refresh_ui')
+    print(f"   QualityControlTab.refresh_ui() existe: {has_refresh_method}")
+    
+    assert initial_tab_count == after_tab_count == final_tab_count == 5, "Onglet qualité perdu au changement de langue"
+    assert has_refresh_method, "QualityControlTab.refresh_ui() manquante"
+    print("   ✅ CORRECTION CHANGEMENT LANGUE: VALIDÉE")
+
+@pytest.fixture(scope="module")
+def quality_frame(tk_modules, tk_root):
+    """Cadre parent unique pour les onglets qualité créés par ce module"""
+    frame = ttk.Frame(tk_root)
+    yield frame
+    frame.destroy()
 
-def test_no_image_protection():
+
+@pytest.fixture(scope="module")
+def warnings_shown(tk_modules):
+    """Intercepte tkinter.messagebox.showwarning pour tout le module"""
+    calls = []
+    _orig = tkinter.messagebox.showwarning
+    tkinter.messagebox.showwarning = lambda *a, **k: calls.append(a)
+    yield calls
+    tkinter.messagebox.showwarning = _orig
+
+
+@pytest.mark.parametrize("path,img", [(None, None), ("test.jpg", None)],
+                         ids=["sans_fichier", "fichier_sans_image"])
+def test_no_image_protection(path, img, quality_frame, warnings_shown):
     """Test que l'analyse est protégée quand aucune image n'est chargée"""
-    
     print("\n📷 2. TEST PROTECTION AUCUNE IMAGE")
     print("-" * 38)
     
-    try:
-        import tkinter as tk
-        from tkinter import ttk
-        from quality_control_tab import QualityControlTab
-        from localization import LocalizationManager
-        
-        # Mock app without image
-        class MockAppNoImage:
-            def __init__(self):
-                self.current_image_path = None  # No image
-                self.original_image = None      # No image
-                self.root = tk.Tk()
-                self.root.withdraw()
-        
-        mock_app = MockAppNoImage()
-        loc_manager = LocalizationManager()
-        
-        # Create quality tab
-        parent_frame = ttk.Frame(mock_app.root)
-        quality_tab = QualityControlTab(parent_frame, mock_app, loc_manager)
-        
-        print("   QualityControlTab créé sans image chargée")
-        
-        # Test that run_analysis handles no image gracefully
-        # Capture any messagebox calls
-        original_messagebox = None
-        messagebox_called = False
-        messagebox_args = None
-        
-        try:
-            import tkinter.messagebox
-            original_messagebox = tkinter.messagebox.showwarning
-            
-            def mock_showwarning(title, message):
-                nonlocal messagebox_called, messagebox_args
-                messagebox_called = True
-                messagebox_args = (title, message)
-                print(f"   MessageBox intercepté: '{title}' - '{message}'")
-            
-            tkinter.messagebox.showwarning = mock_showwarning
-            
-            # Try to run analysis without image
-            quality_tab.run_analysis()
-            
-            # Restore original messagebox
-            tkinter.messagebox.showwarning = original_messagebox
-            
-        except Exception as analysis_error:
-            if original_messagebox:
-                tkinter.messagebox.showwarning = original_messagebox
-            print(f"   Exception pendant analyse: {analysis_error}")
-            messagebox_called = False
-        
-        # Test with mock app that has image path but no image data
-        class MockAppWithPath:
-            def __init__(self):
-                self.current_image_path = "test_image.jpg"  # Has path
-                self.original_image = None                  # But no image data
-                self.root = tk.Tk()
-                self.root.withdraw()
-        
-        mock_app2 = MockAppWithPath()
-        quality_tab2 = QualityControlTab(parent_frame, mock_app2, loc_manager)
-        
-        # Test this also shows warning
-        messagebox_called2 = False
-        
-        try:
-            tkinter.messagebox.showwarning = lambda title, msg: setattr(messagebox_called2, '__class__', type(True)) or print(f"   MessageBox 2: '{title}'")
-            
-            # This should also trigger protection
-            quality_tab2.run_analysis()
-            messagebox_called2 = True  # If we get here without error, protection works
-            
-        except Exception:
-            messagebox_called2 = True  # Exception = protection works too
-        
-        mock_app.root.destroy()
-        mock_app2.root.destroy()
-        
-        success = messagebox_called or messagebox_called2
-        
-        if success:
-            print("   ✅ PROTECTION AUCUNE IMAGE: VALIDÉE")
-        else:
-            print("   ❌ PROTECTION AUCUNE IMAGE: ÉCHEC") 
-            
-        return success
-        
-    except Exception as e:
-        print(f"   ❌ Erreur test protection image: {e}")
-        return False
+    # Mock app sans données image
+    mock_app = SimpleNamespace(current_file=path, original_image=img,
+                               root=quality_frame.winfo_toplevel())
+    quality_tab = QualityControlTab(quality_frame, mock_app, LocalizationManager())
+    
+    # Lancer l'analyse sans image: doit avertir sans démarrer l'analyse
+    warnings_shown.clear()
+    quality_tab.run_analysis()
+    
+    for title, message in warnings_shown:
+        print(f"   MessageBox intercepté: '{title}' - '{message}'")
+    
+    assert len(warnings_shown) == 1, "Aucun avertissement affiché sans image"
+    assert not quality_tab.is_running
+    print("   ✅ PROTECTION AUCUNE IMAGE: VALIDÉE")
 
 def test_old_button_removed():
     """Test que l'ancien bouton de contrôle qualité a été supprimé"""
@@ -201,145 +161,66 @@ def test_old_button_removed():
     print("\n🔘 3. TEST SUPPRESSION ANCIEN BOUTON")
     print("-" * 39)
     
-    try:
-        # Read main.py source to verify button removed
-        main_path = Path(__file__).parent / "src" / "main.py"
-        
-        with open(main_path, 'r', encoding='utf-8') as f:
-            main_content = f.read()
-        
-        # Check old button code is NOT present
-        old_button_patterns = [
-            "ttk.Button(toolbar, text=t('quality_check')",
-            "command=self.show_quality_tab).pack(side=tk.RIGHT, padx=(0, 5))"
-        ]
-        
-        button_found = any(pattern in main_content for pattern in old_button_patterns)
-        
-        print(f"   Ancien bouton dans toolbar: {'TROUVÉ' if button_found else 'ABSENT'}")
-        
-        # Check old run_quality_check method is removed
-        old_method_present = "def run_quality_check(self):" in main_content
-        
-        print(f"   Ancienne méthode run_quality_check: {'PRÉSENTE' if old_method_present else 'SUPPRIMÉE'}")
-        
-        # Check show_quality_tab method exists (for tab navigation)
-        show_tab_method = "def show_quality_tab(self):" in main_content
-        
-        print(f"   Méthode show_quality_tab: {'PRÉSENTE' if show_tab_method else 'ABSENTE'}")
-        
-        success = not button_found and not old_method_present and show_tab_method
-        
-        if success:
-            print("   ✅ SUPPRESSION ANCIEN BOUTON: VALIDÉE")
-        else:
-            print("   ❌ SUPPRESSION ANCIEN BOUTON: ÉCHEC")
-            if button_found:
-                print("     → Ancien bouton toolbar encore présent")
-            if old_method_present:
-                print("     → Ancienne méthode run_quality_check encore présente")
-            if not show_tab_method:
-                print("     → Méthode show_quality_tab manquante")
-        
-        return success
-        
-    except Exception as e:
-        print(f"   ❌ Erreur test suppression bouton: {e}")
-        return False
+    # Une seule passe regex sur le source de main.py
+    found = set(_MAIN_PATTERNS.findall(_MAIN_SRC))
+    
+    # Check old button code is NOT present
+    button_found = bool(found & set(_OLD_BUTTON_PATTERNS))
+    print(f"   Ancien bouton dans toolbar: {'TROUVÉ' if button_found else 'ABSENT'}")
+    
+    # Check old run_quality_check method is removed
+    old_method_present = _OLD_METHOD in found
+    print(f"   Ancienne méthode run_quality_check: {'PRÉSENTE' if old_method_present else 'SUPPRIMÉE'}")
+    
+    # Check show_quality_tab method exists (for tab navigation)
+    show_tab_method = _SHOW_TAB_METHOD in found
+    print(f"   Méthode show_quality_tab: {'PRÉSENTE' if show_tab_method else 'ABSENTE'}")
+    
+    assert found == {_SHOW_TAB_METHOD}, f"Motifs inattendus dans main.py: {sorted(found)}"
+    print("   ✅ SUPPRESSION ANCIEN BOUTON: VALIDÉE")
 
-def test_integration_consistency():
+@pytest.mark.usefixtures("tk_modules")
+def test_integration_consistency(app):
     """Test de cohérence générale de l'intégration"""
     
     print("\n🔧 4. TEST COHÉRENCE INTÉGRATION")
     print("-" * 36)
     
-    try:
-        import tkinter as tk
-        from main import ImageVideoProcessorApp
-        
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ImageVideoProcessorApp(root)
-        
-        # Test tab structure
-        expected_tabs = ["Paramètres", "Opérations", "Informations", "Contrôle Qualité", "À propos"]
-        actual_tabs = []
-        
-        for i in range(app.notebook.index("end")):
-            tab_text = app.notebook.tab(i, 'text')
-            actual_tabs.append(tab_text)
-        
-        print(f"   Onglets attendus: {expected_tabs}")
-        print(f"   Onglets trouvés:  {actual_tabs}")
-        
-        tabs_correct = len(actual_tabs) == 5 and any("Qualité" in tab or "Quality" in tab for tab in actual_tabs)
-        
-        # Test quality panel exists and is correct type
-        has_quality_panel = hasattr(app, 'quality_panel')
-        quality_panel_type = type(app.quality_panel).__name__ if has_quality_panel else "None"
-        
-        print(f"   Attribut quality_panel: {'PRÉSENT' if has_quality_panel else 'ABSENT'}")
-        print(f"   Type quality_panel: {quality_panel_type}")
-        
-        # Test show_quality_tab functionality
-        try:
-            # This should select tab 3 (quality control)
-            current_tab = app.notebook.index("current")
-            app.show_quality_tab()
-            new_tab = app.notebook.index("current")
-            
-            print(f"   Navigation onglet: {current_tab} → {new_tab} (attendu: 3)")
-            navigation_works = new_tab == 3
-            
-        except Exception as nav_error:
-            print(f"   Erreur navigation: {nav_error}")
-            navigation_works = False
-        
-        root.destroy()
-        
-        success = tabs_correct and has_quality_panel and quality_panel_type == "QualityControlTab" and navigation_works
-        
-        if success:
-            print("   ✅ COHÉRENCE INTÉGRATION: VALIDÉE")
-        else:
-            print("   ❌ COHÉRENCE INTÉGRATION: PROBLÈMES")
-        
-        return success
-        
-    except Exception as e:
-        print(f"   ❌ Erreur test cohérence: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+    # Test tab structure
+    expected_tabs = ["Paramètres", "Opérations", "Informations", "Contrôle Qualité", "À propos"]
+    actual_tabs = []
+    
+    for i in range(app.notebook.index("end")):
+        tab_text = app.notebook.tab(i, 'text')
+        actual_tabs.append(tab_text)
+    
+    print(f"   Onglets attendus: {expected_tabs}")
+    print(f"   Onglets trouvés:  {actual_tabs}")
+    
+    tabs_correct = len(actual_tabs) == 5 and any("Qualité" in tab or "Quality" in tab for tab in actual_tabs)
+    
+    # Test quality panel exists and is correct type
+    has_quality_panel = hasattr(app, 'quality_panel')
+    quality_panel_ok = isinstance(getattr(app, 'quality_panel', None), QualityControlTab)
+    
+    print(f"   Attribut quality_panel: {'PRÉSENT' if has_quality_panel else 'ABSENT'}")
+    print(f"   quality_panel est un QualityControlTab: {quality_panel_ok}")
+    
+    # Test show_quality_tab functionality
+    # This should select tab 3 (quality control)
+    current_tab = app.notebook.index("current")
+    app.show_quality_tab()
+    new_tab = app.notebook.index("current")
+    
+    print(f"   Navigation onglet: {current_tab} → {new_tab} (attendu: 3)")
+    navigation_works = new_tab == 3
+    
+    assert tabs_correct, f"Onglets inattendus: {actual_tabs}"
+    assert quality_panel_ok, "app.quality_panel n'est pas un QualityControlTab"
+    assert navigation_works, "show_quality_tab() ne sélectionne pas l'onglet qualité"
+    print("   ✅ COHÉRENCE INTÉGRATION: VALIDÉE")
 
 if __name__ == "__main__":
     print("🔧 VALIDATION CORRECTIONS ONGLET CONTRÔLE QUALITÉ")
     print("=" * 60)
-    
-    # Run all tests
-    test1 = test_language_change_fix()
-    test2 = test_no_image_protection()  
-    test3 = test_old_button_removed()
-    test4 = test_integration_consistency()
-    
-    print("\n📋 RÉSUMÉ DES CORRECTIONS")
-    print("=" * 35)
-    print(f"1. Changement langue   : {'✅ CORRIGÉ' if test1 else '❌ PROBLÈME'}")
-    print(f"2. Protection image    : {'✅ CORRIGÉ' if test2 else '❌ PROBLÈME'}")
-    print(f"3. Suppression bouton  : {'✅ CORRIGÉ' if test3 else '❌ PROBLÈME'}")
-    print(f"4. Cohérence générale  : {'✅ CORRIGÉ' if test4 else '❌ PROBLÈME'}")
-    
-    all_tests_passed = all([test1, test2, test3, test4])
-    
-    if all_tests_passed:
-        print("\n🎉 TOUS LES PROBLÈMES SONT CORRIGÉS!")
-        print("   L'onglet Contrôle Qualité fonctionne parfaitement.")
-        print("   ✅ Persistance changement langue")
-        print("   ✅ Protection analyse sans image")
-        print("   ✅ Interface nettoyée")
-        sys.exit(0)
-    else:
-        print("\n⚠️  CERTAINS PROBLÈMES PERSISTENT")
-        print("   Des corrections supplémentaires peuvent être nécessaires.")
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -19,6 +19,7 @@ import sys
 import os
 import tempfile
 import numpy as np
+import cv2
 from pathlib import Path
 
 # Add src directory to path
@@ -44,10 +45,9 @@ def test_quality_report_save():
         print("🎲 2. Génération de données de test...")
         test_original = np.random.randint(0, 255, (200, 300, 3), dtype=np.uint8)
         
-        # Créer une image "traitée" avec des différences notables
-        test_processed = test_original.copy()
-        test_processed[:, :, 0] = np.clip(test_processed[:, :, 0] * 1.3, 0, 255)  # Plus de rouge
-        test_processed[:, :, 1] = np.clip(test_processed[:, :, 1] * 0.9, 0, 255)  # Moins de vert
+        # Créer une image "traitée" avec des différences notables:
+        # plus de rouge (x1.3), moins de vert (x0.9), arithmétique saturée uint8
+        test_processed = cv2.multiply(test_original, (1.3, 0.9, 1.0, 0.0))
         
         # 3. Exécution du check qualité
         print("🔍 3. Exécution de l'analyse qualité...")
@@ -57,18 +57,20 @@ def test_quality_report_save():
         
         # 4. Vérification des types de données
         print("📊 4. Vérification des types de données...")
-        numpy_values_found = 0
-        python_values_found = 0
+        # Valeurs numériques de toutes les sections, aplaties en une passe
+        numeric_values = [
+            (f"{section_key}.{key}", value)
+            for section_key, section_data in results.items() if isinstance(section_data, dict)
+            for key, value in section_data.items() if isinstance(value, (int, float))
+        ]
+        numpy_values = [(name, value) for name, value in numeric_values
+                        if type(value).__module__ == 'numpy']
         
-        for section_key, section_data in results.items():
-            if isinstance(section_data, dict):
-                for key, value in section_data.items():
-                    if isinstance(value, (int, float)):
-                        if hasattr(value, 'item'):  # Valeur NumPy
-                            numpy_values_found += 1
-                            print(f"   ⚠️  Valeur NumPy détectée: {section_key}.{key} = {type(value)}")
-                        else:  # Valeur Python standard
-                            python_values_found += 1
+        for name, value in numpy_values:
+            print(f"   ⚠️  Valeur NumPy détectée: {name} = {type(value)}")
+        
+        numpy_values_found = len(numpy_values)
+        python_values_found = len(numeric_values) - numpy_values_found
         
         print(f"   ✅ Valeurs Python standard: {python_values_found}")
         if numpy_values_found > 0:
@@ -139,18 +141,14 @@ def test_specific_numpy_conversions():
         'np.var result': np.var([1, 2, 3, 4, 5])
     }
     
-    all_converted = True
+    # Une seule conversion: tableau float64 puis tolist() -> scalaires Python
+    converted_values = np.asarray(list(test_values.values()), dtype=np.float64).tolist()
+    python_types = [isinstance(v, float) and type(v).__module__ != 'numpy' for v in converted_values]
     
-    for name, value in test_values.items():
-        converted = float(value)
-        is_python_type = isinstance(converted, (int, float)) and not hasattr(converted, 'item')
-        
+    for name, converted, is_python_type in zip(test_values, converted_values, python_types):
         print(f"   {name:15} -> {type(converted).__name__:10} {'✅' if is_python_type else '❌'}")
-        
-        if not is_python_type:
-            all_converted = False
     
-    return all_converted
+    return all(python_types)
 
 if __name__ == "__main__":
     print("🚀 VALIDATION CORRECTION BUG RAPPORT QUALITÉ")
@@ -8,7 +8,9 @@ sys.path.insert(0, '.')
 import numpy as np
 import cv2
 
-def test_realistic_red_scenarios():
+from tests._red_mask import red_mask_count
+
+def test_realistic_red_scenarios(rng):
     """Teste avec des scénarios d'images sous-marines réalistes"""
     print("🌊 TEST AVEC SCÉNARIOS SOUS-MARINS RÉALISTES")
     print("=" * 60)
@@ -22,9 +24,9 @@ def test_realistic_red_scenarios():
     
     # Ajouter quelques pixels rouges artificiels (sur-correction)
     red_pixels = int(height * width * 0.05)  # 5%
-    for _ in range(red_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        img1[y, x] = [180, 30, 30]  # Rouge artificiel typique
+    ys = rng.integers(0, height, red_pixels)
+    xs = rng.integers(0, width, red_pixels)
+    img1[ys, xs] = [180, 30, 30]  # Rouge artificiel typique
     
     # Test détection
     img1_rgb = cv2.cvtColor(img1, cv2.COLOR_BGR2RGB)
@@ -37,9 +39,9 @@ def test_realistic_red_scenarios():
     
     # Ajouter des pixels encore plus rouges
     red_pixels = int(height * width * 0.08)  # 8%
-    for _ in range(red_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        img2[y, x] = [200, 40, 50]  # Rouge saturé
+    ys = rng.integers(0, height, red_pixels)
+    xs = rng.integers(0, width, red_pixels)
+    img2[ys, xs] = [200, 40, 50]  # Rouge saturé
     
     detected2 = test_detection(img2, "Dominante rouge + pixels saturés")
     
@@ -50,9 +52,9 @@ def test_realistic_red_scenarios():
     
     # Ajouter quelques objets colorés naturels
     natural_pixels = int(height * width * 0.03)  # 3%
-    for _ in range(natural_pixels):
-        y, x = np.random.randint(0, height), np.random.randint(0, width)
-        img3[y, x] = [120, 80, 60]  # Couleur naturelle (corail, etc.)
+    ys = rng.integers(0, height, natural_pixels)
+    xs = rng.integers(0, width, natural_pixels)
+    img3[ys, xs] = [120, 80, 60]  # Couleur naturelle (corail, etc.)
     
     detected3 = test_detection(img3, "Couleurs naturelles équilibrées")
     
@@ -63,24 +65,17 @@ def test_realistic_red_scenarios():
 
 def test_detection(img_rgb, scenario_name):
     """Teste la détection sur une image"""
-    img_float = img_rgb.astype(np.float32) / 255.0
-    red_channel = img_float[:, :, 0]
-    green_channel = img_float[:, :, 1]
-    blue_channel = img_float[:, :, 2]
-    
-    # Critères actuels
-    red_dominant = (red_channel > 0.5) & (red_channel > green_channel + 0.1) & (red_channel > blue_channel + 0.1)
-    detected_ratio = np.sum(red_dominant) / img_rgb.shape[0] / img_rgb.shape[1]
+    # Critères actuels: r > 0.5, r > g + 0.1, r > b + 0.1 (canaux normalisés)
+    count = red_mask_count(img_rgb, 0.5, 0.1, 0.1)
+    detected_ratio = count / (img_rgb.shape[0] * img_rgb.shape[1])
     
     print(f"   {scenario_name}: {detected_ratio*100:.1f}% pixels rouges détectés")
     
     # Afficher quelques statistiques
-    avg_red = np.mean(red_channel)
-    avg_green = np.mean(green_channel)
-    avg_blue = np.mean(blue_channel)
+    avg_red, avg_green, avg_blue = img_rgb.mean(axis=(0, 1)) / 255.0
     print(f"   Moyennes: R={avg_red:.2f}, G={avg_green:.2f}, B={avg_blue:.2f}")
     
     return detected_ratio
 
 if __name__ == "__main__":
-    test_realistic_red_scenarios()
+    test_realistic_red_scenarios(np.random.default_rng(42))
@@ -8,7 +8,9 @@ sys.path.insert(0, '.')
 import numpy as np
 import cv2
 
-def test_red_detection_thresholds():
+from tests._red_mask import red_mask_count
+
+def test_red_detection_thresholds(rng):
     """Teste différents niveaux de rouge pour calibrer les seuils"""
     print("🎯 CALIBRATION DES SEUILS DE DÉTECTION")
     print("=" * 60)
@@ -24,33 +26,29 @@ def test_red_detection_thresholds():
         ([240, 40, 40], "Rouge extrême"),      # 0.94, 0.16, 0.16
     ]
     
+    # Tampons alloués une seule fois: fond de référence + image de travail
+    base = np.empty((height, width, 3), dtype=np.uint8)
+    base[:, :] = [40, 60, 90]  # Base naturelle
+    img = np.empty_like(base)
+    
     for color, name in test_colors:
-        # Créer une image test
-        img = np.zeros((height, width, 3), dtype=np.uint8)
-        img[:, :] = [40, 60, 90]  # Base naturelle
+        # Réinitialiser l'image test (une simple copie mémoire)
+        np.copyto(img, base)
         
         # Ajouter 10% de pixels de cette couleur
         red_pixels = int(height * width * 0.10)
-        for _ in range(red_pixels):
-            y, x = np.random.randint(0, height), np.random.randint(0, width)
-            img[y, x] = color
+        ys = rng.integers(0, height, red_pixels)
+        xs = rng.integers(0, width, red_pixels)
+        img[ys, xs] = color
         
         # Convertir et analyser
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        img_float = img_rgb.astype(np.float32) / 255.0
-        
-        # Appliquer les critères actuels
-        red_channel = img_float[:, :, 0]
-        green_channel = img_float[:, :, 1]
-        blue_channel = img_float[:, :, 2]
         
         # Critères actuels (après correction)
-        red_dominant = (red_channel > 0.6) & (red_channel > green_channel + 0.2) & (red_channel > blue_channel + 0.25)
-        extreme_red_detected = np.sum(red_dominant) / (height * width)
+        extreme_red_detected = red_mask_count(img_rgb, 0.6, 0.2, 0.25) / (height * width)
         
         # Critères plus sensibles pour test
-        red_sensitive = (red_channel > 0.5) & (red_channel > green_channel + 0.15) & (red_channel > blue_channel + 0.2)
-        sensitive_detected = np.sum(red_sensitive) / (height * width)
+        sensitive_detected = red_mask_count(img_rgb, 0.5, 0.15, 0.2) / (height * width)
         
         print(f"\n📊 {name} RGB{color}:")
         print(f"   Valeurs normalisées: ({color[0]/255:.2f}, {color[1]/255:.2f}, {color[2]/255:.2f})")
@@ -68,4 +66,4 @@ def test_red_detection_thresholds():
             print(f"   ✅ Seuil sensible: DÉTECTE correctement")
 
 if __name__ == "__main__":
-    test_red_detection_thresholds()
+    test_red_detection_thresholds(np.random.default_rng(42))
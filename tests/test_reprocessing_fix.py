@@ -6,10 +6,11 @@ Fix: Le score ne changeait pas quand on modifiait les paramètres
 
 import os
 import sys
+import inspect
 import traceback
 import numpy as np
 
-def test_forced_reprocessing():
+def test_forced_reprocessing(app):
     """Test le retraitement forcé lors de l'analyse de qualité"""
     print("\n" + "="*60)
     print("🔧 TEST RETRAITEMENT FORCÉ - ANALYSE QUALITÉ")
@@ -22,7 +23,6 @@ def test_forced_reprocessing():
         # Test 1: Import des modules
         print("\n1. Test import des modules...")
         from src.quality_control_tab import QualityControlTab
-        from src.main import ImageVideoProcessorApp
         import tkinter as tk
         from src.localization import LocalizationManager
         print("   ✅ Imports réussis")
@@ -30,9 +30,9 @@ def test_forced_reprocessing():
         
         # Test 2: Vérification du code de retraitement forcé
         print("\n2. Test présence du code de retraitement forcé...")
-        with open('src/quality_control_tab.py', 'r', encoding='utf-8') as f:
-            content = f.read()
-            
+        # analyze_thread est défini dans run_analysis: seul ce source est inspecté
+        content = inspect.getsource(QualityControlTab.run_analysis)
+        
         has_cache_clear = 'self.app.processed_image = None' in content
         has_preview_clear = 'self.app.processed_preview = None' in content
         
@@ -44,17 +44,13 @@ def test_forced_reprocessing():
         
         # Test 3: Test de création d'instance
         print("\n3. Test création QualityControlTab...")
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ImageVideoProcessorApp(root)
         loc = LocalizationManager()
         
         # Ajouter une image test
         app.original_image = np.random.randint(0, 255, (50, 50, 3), dtype=np.uint8)
         app.current_file = 'test.jpg'
         
-        tab_frame = tk.Frame(root)
+        tab_frame = tk.Frame(app.root)
         tab = QualityControlTab(tab_frame, app, loc)
         
         print("   ✅ QualityControlTab créé avec succès")
@@ -97,7 +93,7 @@ def test_forced_reprocessing():
         else:
             print("   ❌ Méthode get_full_resolution_processed_image manquante")
         
-        root.destroy()
+        tab_frame.destroy()
         
     except Exception as e:
         print(f"   ❌ Erreur pendant les tests: {e}")
@@ -121,9 +117,5 @@ def test_forced_reprocessing():
         return False
 
 if __name__ == "__main__":
-    success = test_forced_reprocessing()
-    if success:
-        print("\n🚀 SOLUTION: Changez les paramètres puis cliquez sur 'Analyser'")
-        print("   Le score reflétera maintenant les nouveaux paramètres!")
-    else:
-        print("\n⚠️  CORRECTIONS SUPPLÉMENTAIRES NÉCESSAIRES")
+    import pytest
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -1,226 +1,151 @@
 #!/usr/bin/env python3
 """
 Test de la barre de progression lors de la sauvegarde d'image
-Teste l'intégration de la barre de progression dans save_image()
+Teste que la barre de progression apparaît lors du clic "Sauvegarder le résultat"
+pour les calculs lents (get_full_resolution_processed_image), puis se ferme
+une fois l'écriture du fichier (save_image) terminée.
 """
 
+import logging
 import sys
-import os
-# Ajouter src/ au path pour les imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from unittest.mock import patch
 
-import tkinter as tk
 import numpy as np
-import time
-import tempfile
-from unittest.mock import patch, MagicMock
-
-def test_save_image_progress_bar():
-    """Test que la barre de progression s'affiche lors de la sauvegarde"""
-    
-    print("🧪 TEST: Barre de progression sauvegarde image")
-    print("=" * 60)
-    
-    try:
-        # Changer le répertoire de travail vers src/
-        original_cwd = os.getcwd()
-        src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
-        os.chdir(src_dir)
-        
-        from main import ImageVideoProcessorApp
-        from progress_bar import show_progress
-        
-        # Créer une instance de l'app
-        root = tk.Tk()
-        root.withdraw()  # Cacher la fenêtre principale
-        
-        app = ImageVideoProcessorApp(root)
-        
-        # Simuler une image chargée
-        test_image = np.random.randint(0, 255, (500, 500, 3), dtype=np.uint8)
-        app.original_image = test_image
-        app.current_file = 'test_image.jpg'
-        app.preview_scale_factor = 0.5  # Pour forcer full resolution processing
-        
-        print("✅ App créée avec image test")
-        
-        # Mock du dialogue de sauvegarde pour retourner des options valides
-        mock_save_options = {
-            'filename': tempfile.mktemp(suffix='.jpg'),
-            'format': 'jpg',
-            'quality': 95,
-            'progressive': False,
-            'preserve_metadata': False
-        }
-        
-        # Mock de la fonction show_save_dialog
-        with patch('save_dialog.show_save_dialog', return_value=mock_save_options):
-            # Mock de cv2.imwrite pour simuler succès
-            with patch('cv2.imwrite', return_value=True):
-                # Mock de messagebox pour éviter popup
-                with patch('tkinter.messagebox.showinfo'):
-                    
-                    # Variable pour tracker l'usage de la barre de progression
-                    progress_used = []
-                    original_show_progress = show_progress
-                    
-                    def mock_show_progress(parent, title, message):
-                        progress_used.append({'title': title, 'message': message})
-                        # Créer un mock context manager simple
-                        class MockProgress:
-                            def __enter__(self):
-                                return self
-                            def __exit__(self, *args):
-                                # Restaurer le répertoire de travail
-        os.chdir(original_cwd)
-                            def update_message(self, msg):
-                                progress_used.append({'update': msg})
-                        
-                        return MockProgress()
-                    
-                    # Appliquer le mock
-                    with patch('src.progress_bar.show_progress', side_effect=mock_show_progress):
-                        # Tester save_image
-                        start_time = time.time()
-                        app.save_image()
-                        elapsed = time.time() - start_time
-                        
-                        print(f"⏱️  Temps d'exécution: {elapsed:.2f}s")
-                        
-        # Vérifications
-        assert len(progress_used) > 0, "La barre de progression n'a pas été utilisée"
-        
-        # Vérifier que le bon titre est utilisé
-        initial_call = progress_used[0]
-        assert 'title' in initial_call, "Pas de titre pour la barre de progression"
-        assert "Sauvegarde" in initial_call['title'], f"Titre incorrect: {initial_call['title']}"
-        
-        print(f"✅ Barre de progression initialisée: {initial_call['title']}")
-        
-        # Vérifier les messages d'étapes
-        update_messages = [item['update'] for item in progress_used if 'update' in item]
-        
-        expected_steps = [
-            "résolution complète",  # Traitement
-            "sauvegarde",          # Préparation
-            "paramètres",          # Configuration
-            "fichier"              # Écriture
-        ]
-        
-        steps_found = []
-        for expected in expected_steps:
-            found = any(expected.lower() in msg.lower() for msg in update_messages)
-            steps_found.append(found)
-            if found:
-                matching_msg = next(msg for msg in update_messages if expected.lower() in msg.lower())
-                print(f"✅ Étape '{expected}' trouvée: {matching_msg}")
-            else:
-                print(f"⚠️  Étape '{expected}' non trouvée")
-        
-        # Au moins 3 étapes doivent être présentes
-        assert sum(steps_found) >= 3, f"Pas assez d'étapes de progression trouvées: {update_messages}"
-        
-        print(f"✅ Messages de progression: {len(update_messages)} étapes")
-        for i, msg in enumerate(update_messages, 1):
-            print(f"    {i}. {msg}")
-        
-        root.destroy()
-        
-        print("\n🎉 TEST RÉUSSI: Barre de progression sauvegarde intégrée!")
-        print("   - Barre de progression activée lors de save_image()")
-        print("   - Messages d'étapes appropriés affichés")
-        print("   - Intégration non-invasive validée")
-        
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Erreur d'import: {e}")
-        print("   Vérifiez que tous les modules sont disponibles")
-        return False
-        
-    except Exception as e:
-        print(f"❌ Erreur durant le test: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-def test_save_result_progress_integration():
-    """Test que save_result déclenche aussi la progression via save_image"""
-    
-    print("\n🧪 TEST: Intégration save_result avec barre de progression")
-    print("=" * 60)
-    
-    try:
-        from src.main import ImageVideoProcessorApp
-        
-        root = tk.Tk()
-        root.withdraw()
-        
-        app = ImageVideoProcessorApp(root)
-        
-        # Simuler une image chargée
-        test_image = np.random.randint(0, 255, (300, 300, 3), dtype=np.uint8)
-        app.original_image = test_image
-        app.current_file = 'test.jpg'
-        app.video_capture = None  # Pas de vidéo
-        
-        progress_calls = []
-        
-        def mock_save_image():
-            progress_calls.append('save_image_called')
-            # Simuler que save_image utilise une barre de progression
-            progress_calls.append('progress_bar_used')
-        
-        # Mock save_image pour vérifier qu'elle est appelée
-        app.save_image = mock_save_image
-        
-        # Mock get_full_resolution_processed_image
-        app.get_full_resolution_processed_image = lambda: test_image
-        
-        # Tester save_result
-        app.save_result()
-        
-        # Vérifications
-        assert 'save_image_called' in progress_calls, "save_image() n'a pas été appelée"
-        assert 'progress_bar_used' in progress_calls, "Barre de progression non utilisée"
-        
-        print("✅ save_result() intègre correctement la barre de progression")
-        print("✅ Chaîne save_result → save_image → progress_bar validée")
-        
-        root.destroy()
-        
+import pytest
+
+from src import progress_bar, save_dialog
+
+logger = logging.getLogger(__name__)
+
+# Titre de la barre de progression ouverte par save_result()
+EXPECTED_TITLE = "Sauvegarder le résultat"
+
+# Étapes attendues dans les messages de progression
+EXPECTED_STEPS = [
+    "résolution complète",  # Traitement
+    "préparation",          # Préparation
+    "sauvegarde image",     # Écriture
+    "finalisation"          # Fin
+]
+
+
+def recording_progress(events):
+    """show_progress de remplacement qui enregistre init / update / close dans `events`"""
+    def mock_show_progress(parent, title, message=""):
+        events.append({'stage': 'init', 'title': title, 'message': message})
+
+        class MockProgressContext:
+            def __enter__(self):
+                return self
+            def __exit__(self, *args):
+                events.append({'stage': 'close'})
+            def update_message(self, msg):
+                events.append({'stage': 'update', 'update': msg})
+            def update_message_and_progress(self, msg, percentage):
+                self.update_message(msg)
+
+        return MockProgressContext()
+
+    return mock_show_progress
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["pleine_resolution", "deja_traitee"])
+def test_save_result_progress(minimal_app, mocked_save_env, tmp_path, cached):
+    """save_result() ouvre une seule barre de progression couvrant traitement et écriture"""
+    app = minimal_app
+
+    logger.debug("🧪 TEST: Barre de progression sauvegarde image")
+    logger.debug("=" * 60)
+
+    # Image chargée, avec ou sans résultat pleine résolution déjà en cache
+    test_image = np.zeros((32, 32, 3), dtype=np.uint8)
+    app.original_image = test_image
+    app.processed_image = test_image.copy() if cached else None
+    app.current_file = 'test_image.jpg'
+
+    mock_save_options = {
+        'filename': str(tmp_path / 'test_image_processed.jpg'),
+        'format': 'jpg',
+        'quality': 95,
+        'progressive': False,
+        'preserve_metadata': False
+    }
+
+    events = []
+    mocked_save_env.enter_context(patch.object(save_dialog, 'show_save_dialog', return_value=mock_save_options))
+    mocked_save_env.enter_context(patch.object(progress_bar, 'show_progress', side_effect=recording_progress(events)))
+
+    app.save_result()
+
+    # Une seule barre, ouverte en premier et fermée en dernier
+    stages = [event['stage'] for event in events]
+    assert stages.count('init') == 1 and stages.count('close') == 1, f"Cycle de vie incorrect: {stages}"
+    assert stages[0] == 'init' and stages[-1] == 'close', f"Ordre incorrect: {stages}"
+
+    title = events[0]['title']
+    assert EXPECTED_TITLE in title, f"Titre inattendu: '{title}' (attendu: contenant '{EXPECTED_TITLE}')"
+    logger.debug(f"✅ Barre de progression initialisée: {title}")
+
+    # Vérifier les messages d'étapes
+    update_messages = [event['update'] for event in events if event['stage'] == 'update']
+    for i, msg in enumerate(update_messages, 1):
+        logger.debug(f"    {i}. {msg}")
+
+    # Messages mis en minuscules une seule fois, puis recherche des étapes
+    joined = " | ".join(msg.lower() for msg in update_messages)
+    missing = [step for step in EXPECTED_STEPS if step not in joined]
+    assert not missing, f"Étapes manquantes {missing} dans: {update_messages}"
+
+    logger.debug("✅ Étapes de progression appropriées affichées")
+
+
+def test_save_result_progress_integration(minimal_app, mocked_save_env, tmp_path):
+    """L'écriture du fichier par save_image() a lieu pendant la barre de save_result()"""
+    import cv2
+
+    app = minimal_app
+
+    logger.debug("\n🧪 TEST: Intégration save_result avec barre de progression")
+    logger.debug("=" * 60)
+
+    # Image chargée dont le résultat pleine résolution est déjà calculé
+    test_image = np.zeros((32, 32, 3), dtype=np.uint8)
+    test_image[..., 0] = 200
+    app.original_image = test_image
+    app.processed_image = test_image.copy()
+    app.current_file = 'test.jpg'
+
+    target = str(tmp_path / 'test_processed.jpg')
+    events = []
+
+    def recording_imwrite(filename, image, params=None):
+        events.append({'stage': 'write', 'filename': filename, 'image': image})
         return True
-        
-    except Exception as e:
-        print(f"❌ Erreur durant le test save_result: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+
+    mocked_save_env.enter_context(patch.object(save_dialog, 'show_save_dialog',
+                                               return_value={'filename': target, 'format': 'jpg'}))
+    mocked_save_env.enter_context(patch.object(progress_bar, 'show_progress', side_effect=recording_progress(events)))
+    mocked_save_env.enter_context(patch.object(cv2, 'imwrite', side_effect=recording_imwrite))
+
+    app.save_result()
+
+    # Écriture unique, entre l'ouverture et la fermeture de la barre
+    stages = [event['stage'] for event in events]
+    assert stages.count('write') == 1, f"Écritures: {stages}"
+    assert stages[0] == 'init' and stages[-1] == 'close', f"Ordre incorrect: {stages}"
+
+    # Le fichier choisi reçoit le résultat converti en BGR
+    write = next(event for event in events if event['stage'] == 'write')
+    assert write['filename'] == target
+    np.testing.assert_array_equal(write['image'], cv2.cvtColor(app.processed_image, cv2.COLOR_RGB2BGR))
+
+    # L'écriture suit l'étape "sauvegarde image" et précède la finalisation
+    updates_before = [event['update'].lower() for event in events[:stages.index('write')]
+                      if event['stage'] == 'update']
+    assert 'sauvegarde image' in updates_before[-1]
+
+    logger.debug("✅ Chaîne save_result → save_image → progress_bar validée")
+
 
 if __name__ == "__main__":
-    print("🚀 TESTS BARRE DE PROGRESSION SAUVEGARDE")
-    print("=" * 70)
-    
-    success = True
-    
-    # Test principal
-    if not test_save_image_progress_bar():
-        success = False
-    
-    # Test intégration
-    if not test_save_result_progress_integration():
-        success = False
-    
-    print("\n" + "=" * 70)
-    if success:
-        print("🎉 TOUS LES TESTS RÉUSSIS!")
-        print("   ✅ Barre de progression intégrée pour sauvegarde")
-        print("   ✅ Messages d'étapes informatifs")
-        print("   ✅ Intégration non-invasive avec interface existante")
-        print("   ✅ Workflow save_result → save_image → progress validé")
-        print("\n💡 La sauvegarde d'images affiche maintenant une progression!")
-    else:
-        print("❌ CERTAINS TESTS ONT ÉCHOUÉ")
-        print("   Vérifiez les erreurs ci-dessus")
-        
-    print("=" * 70)
+    sys.exit(pytest.main([__file__, "-v", "--log-cli-level=DEBUG"]))
@@ -3,76 +3,71 @@
 Simple test to validate white balance parameter synchronization fix
 """
 
-try:
-    import sys
-    sys.path.insert(0, '.')
-    
-    from src.quality_control_tab import QualityControlTab
-    from src.main import ImageVideoProcessorApp
-    import tkinter as tk
-    from src.localization import LocalizationManager
-    import numpy as np
-    
-    print("🔧 Testing Quality Control Cache Fix")
-    print("=" * 40)
-    
-    # Create test setup
-    root = tk.Tk()
-    root.withdraw()
-    
-    app = ImageVideoProcessorApp(root)
-    loc = LocalizationManager()
-    
+import logging
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+logger = logging.getLogger(__name__)
+
+
+def test_cache_cleared_after_parameter_sync(app):
+    """The full resolution cache is rebuilt after update_preview() + forced clear"""
+    logger.debug("🔧 Testing Quality Control Cache Fix")
+    logger.debug("=" * 40)
+
     # Add test image
-    app.original_image = np.random.randint(0, 255, (50, 50, 3), dtype=np.uint8)
+    app.original_image = np.zeros((32, 32, 3), dtype=np.uint8)
     app.current_file = 'test.jpg'
-    
-    print("✅ App and test image created")
-    
+
+    logger.debug("✅ App and test image created")
+
     # Test 1: Check initial state
     initial_method = app.processor.get_parameter('white_balance_method')
-    print(f"📋 Initial white balance method: {initial_method}")
-    
-    # Test 2: Change parameter
-    app.processor.set_parameter('white_balance_method', 'white_patch')
-    new_method = app.processor.get_parameter('white_balance_method')
-    print(f"🔄 Changed white balance method to: {new_method}")
-    
-    # Test 3: Simulate quality control cache clearing logic
-    print("🧹 Simulating quality control cache clearing...")
-    
-    # Step 1: Clear caches
-    app.processed_image = None
-    app.processed_preview = None
-    print("   Cache cleared initially")
-    
-    # Step 2: Call update_preview (which may not clear full-res cache)
-    if hasattr(app, 'update_preview'):
+    logger.debug(f"📋 Initial white balance method: {initial_method}")
+
+    try:
+        # Test 2: Change parameter
+        app.processor.set_parameter('white_balance_method', 'white_patch')
+        new_method = app.processor.get_parameter('white_balance_method')
+        logger.debug(f"🔄 Changed white balance method to: {new_method}")
+        assert new_method == 'white_patch'
+
+        # Test 3: Simulate quality control cache clearing logic
+        logger.debug("🧹 Simulating quality control cache clearing...")
+
+        # Step 1: Clear caches
+        app.processed_image = None
+        app.processed_preview = None
+        logger.debug("   Cache cleared initially")
+
+        # Step 2: Call update_preview (which may not clear full-res cache)
         app.update_preview()
         cache_after_update = app.processed_image is not None
-        print(f"   After update_preview(): cached={cache_after_update}")
-    
-    # Step 3: Force cache clear again (THE FIX)
-    app.processed_image = None
-    print("   Forced cache clear after update_preview() (THE FIX)")
-    
-    # Step 4: Get processed image
-    processed = app.get_full_resolution_processed_image()
-    final_cache_state = app.processed_image is not None
-    print(f"   Final: processed={processed is not None}, cached={final_cache_state}")
-    
-    print("\n✅ Cache clearing logic test PASSED")
-    print("   The fix ensures cache is cleared after parameter sync")
-    
-    root.destroy()
-    
-    print("\n🎯 CONCLUSION:")
-    print("   Quality control now properly clears cache AFTER update_preview()")
-    print("   This ensures parameter changes affect quality analysis results")
-    
-except Exception as e:
-    print(f"❌ Error: {e}")
-    import traceback
-    traceback.print_exc()
-
-print("\n🏁 Simple validation completed!")
+        logger.debug(f"   After update_preview(): cached={cache_after_update}")
+
+        # Step 3: Force cache clear again (THE FIX)
+        app.processed_image = None
+        logger.debug("   Forced cache clear after update_preview() (THE FIX)")
+
+        # Step 4: Get processed image
+        processed = app.get_full_resolution_processed_image()
+        final_cache_state = app.processed_image is not None
+        logger.debug(f"   Final: processed={processed is not None}, cached={final_cache_state}")
+        assert processed is not None and final_cache_state
+    finally:
+        # The app is shared by the whole session: restore the parameter
+        app.processor.set_parameter('white_balance_method', initial_method)
+
+    logger.debug("\n✅ Cache clearing logic test PASSED")
+    logger.debug("   The fix ensures cache is cleared after parameter sync")
+
+    logger.debug("\n🎯 CONCLUSION:")
+    logger.debug("   Quality control now properly clears cache AFTER update_preview()")
+    logger.debug("   This ensures parameter changes affect quality analysis results")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "--log-cli-level=DEBUG"]))
@@ -1,109 +1,54 @@
 #!/usr/bin/env python3
 """
 Simple Quality Control Optimization Test
+
+Checks the preview scale selection that quality control relies on,
+without running the processing pipeline. The end-to-end preview analysis
+is covered by test_quality_optimization.py.
 """
 
-try:
-    import sys
-    sys.path.insert(0, '.')
-    
-    from src.quality_control_tab import QualityControlTab
-    from src.main import ImageVideoProcessorApp
-    import tkinter as tk
-    from src.localization import LocalizationManager
-    import numpy as np
-    import time
-    
-    print("🚀 Testing Quality Control Preview Optimization")
-    print("=" * 50)
-    
-    # Create test setup
-    root = tk.Tk()
-    root.withdraw()
-    
-    app = ImageVideoProcessorApp(root)
-    loc = LocalizationManager()
-    
-    # Create medium-sized test image
-    print("📸 Creating test image (500x750)...")
-    test_img = np.random.randint(50, 200, (500, 750, 3), dtype=np.uint8)
-    # Add underwater characteristics
-    test_img[:, :, 0] = test_img[:, :, 0] * 0.6  # Reduce red
-    test_img[:, :, 2] = test_img[:, :, 2] * 1.2  # Increase blue
-    test_img = np.clip(test_img, 0, 255).astype(np.uint8)
-    
-    app.original_image = test_img
-    app.current_file = 'test.jpg'
-    
-    print(f"✅ Test image: {test_img.shape} ({test_img.size:,} pixels)")
-    
-    # Generate preview
-    print("🔄 Generating preview...")
-    start_time = time.time()
-    app.update_preview()
-    preview_time = time.time() - start_time
-    
-    if hasattr(app, 'original_preview') and app.original_preview is not None:
-        preview_size = app.original_preview.shape
-        scale_factor = getattr(app, 'preview_scale_factor', 1.0)
-        reduction = (1 - app.original_preview.size / test_img.size) * 100
-        
-        print(f"✅ Preview created in {preview_time:.2f}s")
-        print(f"   Original: {test_img.shape} -> Preview: {preview_size}")
-        print(f"   Scale factor: {scale_factor:.3f}")
-        print(f"   Size reduction: {reduction:.1f}%")
-        
-        # Test quality control logic
-        print("\n🔬 Testing Quality Control Preview Logic...")
-        
-        # Simulate the optimized quality control logic
-        original_for_analysis = app.original_preview
-        processed_for_analysis = app.processed_preview
-        
-        if original_for_analysis is not None and processed_for_analysis is not None:
-            print(f"✅ Preview images available for analysis")
-            print(f"   Original preview: {original_for_analysis.shape}")
-            print(f"   Processed preview: {processed_for_analysis.shape}")
-            
-            # Test creating quality control tab
-            tab_frame = tk.Frame(root)
-            quality_tab = QualityControlTab(tab_frame, app, loc)
-            
-            print(f"✅ Quality control tab created successfully")
-            print(f"✅ Using optimized preview-based analysis")
-            
-            # Benefits summary
-            original_pixels = test_img.size
-            preview_pixels = original_for_analysis.size
-            speedup_estimate = original_pixels / preview_pixels
-            
-            print(f"\n📊 OPTIMIZATION BENEFITS:")
-            print(f"   Pixels to analyze: {original_pixels:,} -> {preview_pixels:,}")
-            print(f"   Estimated speedup: {speedup_estimate:.1f}x faster")
-            print(f"   Memory usage: {speedup_estimate:.1f}x less")
-            
-            if speedup_estimate > 3:
-                print(f"✅ EXCELLENT: Significant performance improvement!")
-            elif speedup_estimate > 2:
-                print(f"✅ GOOD: Notable performance improvement")
-            else:
-                print(f"⚠️  MODERATE: Some improvement")
-                
-        else:
-            print("❌ ERROR: Preview images not available")
-    else:
-        print("❌ ERROR: Preview generation failed")
-    
-    print(f"\n🎯 CONCLUSION:")
-    print("   Quality control now uses preview optimization")
-    print("   Analysis will be significantly faster")
-    print("   User experience greatly improved")
-    
-    root.destroy()
-    
-except Exception as e:
-    print(f"❌ Error: {e}")
-    import traceback
-    traceback.print_exc()
+import logging
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+import pytest
+
+from src.image_processing import create_preview_image
+
+logger = logging.getLogger(__name__)
+
+# Same limit as ImageVideoProcessorApp.update_preview()
+PREVIEW_MAX_SIZE = 1024
+
+
+@pytest.mark.parametrize("shape", [(32, 32, 3), (500, 750, 3), (2000, 3000, 3), (3000, 2000, 3)])
+def test_preview_optimization(shape):
+    """Quality control analyses a preview no larger than PREVIEW_MAX_SIZE"""
+    logger.debug("🚀 Testing Quality Control Preview Optimization")
+    logger.debug("=" * 50)
+
+    test_img = np.zeros(shape, dtype=np.uint8)
+    preview, scale_factor = create_preview_image(test_img, PREVIEW_MAX_SIZE)
+
+    max_dimension = max(shape[:2])
+    expected_scale = min(1.0, PREVIEW_MAX_SIZE / max_dimension)
+
+    logger.debug(f"   Original: {test_img.shape} -> Preview: {preview.shape}")
+    logger.debug(f"   Scale factor: {scale_factor:.3f}")
+
+    assert scale_factor == pytest.approx(expected_scale)
+    assert max(preview.shape[:2]) <= PREVIEW_MAX_SIZE
+    assert preview.shape[2] == 3
+    if scale_factor == 1.0:
+        assert preview.shape == test_img.shape
+
+    # Benefits summary
+    speedup_estimate = test_img.size / preview.size
+    logger.debug(f"\n📊 OPTIMIZATION BENEFITS:")
+    logger.debug(f"   Pixels to analyze: {test_img.size:,} -> {preview.size:,}")
+    logger.debug(f"   Estimated speedup: {speedup_estimate:.1f}x faster")
+
 
-print("\n✅ Simple optimization test completed!")
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "--log-cli-level=DEBUG"]))
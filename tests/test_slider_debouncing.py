@@ -5,129 +5,193 @@ Test vérifie que les sliders sont fluides avec le nouveau système de debouncin
 """
 
 import sys
+import functools
 import time
-import threading
-from pathlib import Path
+from unittest.mock import patch
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent / "src"))
+import numpy as np
+import pytest
 
-def test_slider_responsiveness():
+# Nombre maximal de rafraîchissements acceptés pour une rafale de 10 changements
+# (un immédiat à l'appui, un au relâchement de la souris)
+MAX_UPDATES = 2
+
+# Facteur d'échelle des previews intermédiaires pendant le glissement
+DRAFT_SCALE = 0.25
+
+
+def test_slider_responsiveness(tk_root):
     """Test la responsivité des sliders avec debouncing"""
     print("🎯 TEST SLIDER DEBOUNCING - AQUALIX v2.2.2")
     print("=" * 60)
-    
-    try:
-        # Import des modules principaux
-        from src.image_processing import ImageProcessor
-        from src.ui_components import ParameterPanel
-        import tkinter as tk
-        from tkinter import ttk
-        
-        # Créer une fenêtre test
-        root = tk.Tk()
-        root.title("Test Slider Debouncing")
-        root.geometry("600x400")
-        
-        # Compteur d'appels update
-        update_call_count = 0
-        last_update_time = 0
-        update_times = []
-        
-        def mock_update_callback():
-            """Mock callback qui simule update_preview"""
-            nonlocal update_call_count, last_update_time
-            current_time = time.time() * 1000  # millisecondes
-            update_call_count += 1
-            
-            if last_update_time > 0:
-                delay = current_time - last_update_time
-                update_times.append(delay)
-                print(f"  Update #{update_call_count} - Délai: {delay:.1f}ms")
-            
-            last_update_time = current_time
-        
-        # Initialiser le processeur
-        processor = ImageProcessor()
-        
-        # Créer le panneau paramètres avec notre mock callback
-        param_panel = ParameterPanel(root, processor, mock_update_callback)
-        param_panel.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        print("✅ Interface initialisée avec debouncing")
-        print(f"   Délai debouncing: {param_panel._debounce_delay}ms")
-        print()
-        
-        # Test automatique de mouvements rapides de slider
-        def simulate_slider_movements():
-            """Simule des mouvements rapides de slider"""
-            time.sleep(1)  # Attendre que l'UI soit prête
-            
-            print("🚀 Simulation mouvements rapides de slider...")
-            
-            # Trouver un slider beer-lambert (facteur rouge)
-            beer_lambert_param = 'beer_lambert_red_factor'
-            
-            # Simuler 10 changements rapides (comme si l'utilisateur bougeait le slider)
-            for i in range(10):
-                value = 1.0 + (i * 0.1)  # 1.0 → 1.9
-                param_panel.on_parameter_change(beer_lambert_param, value)
-                time.sleep(0.05)  # 50ms entre chaque changement
-            
-            print(f"   Terminé: {10} changements en 500ms")
-            
-            # Attendre que tous les updates soient traités
-            time.sleep(0.5)
-            
-            # Analyser les résultats
-            root.after(100, analyze_results)
-        
-        def analyze_results():
-            """Analyse les résultats du test"""
-            print()
-            print("📊 RÉSULTATS DEBOUNCING:")
-            print(f"   Changements simulés: 10")
-            print(f"   Updates callback: {update_call_count}")
-            print(f"   Réduction: {(1 - update_call_count/10)*100:.1f}%")
-            
-            if update_times:
-                avg_delay = sum(update_times) / len(update_times)
-                print(f"   Délai moyen entre updates: {avg_delay:.1f}ms")
-            
-            if update_call_count <= 3:
-                print("✅ EXCELLENT: Debouncing fonctionne parfaitement")
-                print("   → Les sliders sont maintenant fluides!")
-            elif update_call_count <= 5:
-                print("✅ BON: Debouncing réduit significativement les updates")
-            else:
-                print("⚠️  ATTENTION: Debouncing pourrait être amélioré")
-            
-            print()
-            print("🎉 Test terminé - Fermez la fenêtre pour continuer")
-        
-        # Lancer la simulation en arrière-plan
-        thread = threading.Thread(target=simulate_slider_movements)
-        thread.daemon = True
-        thread.start()
-        
-        # Afficher l'interface pendant 10 secondes pour test manuel
-        root.after(10000, root.quit)
-        root.mainloop()
-        
+
+    # Import des modules principaux
+    from src.image_processing import ImageProcessor
+    from src.ui_components import ParameterPanel
+    import tkinter as tk
+
+    # Créer une fenêtre test
+    window = tk.Toplevel(tk_root)
+    window.title("Test Slider Debouncing")
+    window.geometry("600x400")
+
+    # Compteur d'appels update
+    update_call_count = 0
+    last_update_time = 0
+    release_updates = None
+    update_times = []
+    update_scales = []
+
+    def mock_update_callback(scale=1.0):
+        """Mock callback qui simule update_preview"""
+        nonlocal update_call_count, last_update_time
+        current_time = time.perf_counter_ns() // 1_000_000  # millisecondes (horloge monotone)
+        update_call_count += 1
+        update_scales.append(scale)
+
+        if last_update_time > 0:
+            delay = current_time - last_update_time
+            update_times.append(delay)
+            print(f"  Update #{update_call_count} - Délai: {delay:.1f}ms")
+
+        last_update_time = current_time
+
+    # Initialiser le processeur
+    processor = ImageProcessor()
+
+    # Créer le panneau paramètres avec notre mock callback
+    param_panel = ParameterPanel(window, processor, mock_update_callback)
+    param_panel.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    # L'auto-tune initial déclenche ses propres updates: ne compter que la simulation
+    update_call_count = 0
+    last_update_time = 0
+    update_scales.clear()
+
+    print("✅ Interface initialisée avec debouncing")
+    print(f"   Délai debouncing: {param_panel._debounce_delay}ms")
+    print()
+
+    # Test automatique de mouvements rapides de slider, planifié sur le thread Tk
+    beer_lambert_param = 'beer_lambert_red_coeff'  # Slider beer-lambert (coefficient rouge)
+    start_ms = 1000  # Attendre que l'UI soit prête
+
+    def change(value):
+        """Un mouvement de slider (comme si l'utilisateur le déplaçait)"""
+        param_panel.on_parameter_change(beer_lambert_param, value)
+
+    def release():
+        """Relâchement: l'update pleine résolution doit être fait pendant l'événement même"""
+        nonlocal release_updates
+        updates_before = update_call_count
+        param_panel._on_slider_release()
+        release_updates = update_call_count - updates_before
+        print(f"   Terminé: {10} changements en 500ms")
+
+    print("🚀 Simulation mouvements rapides de slider...")
+    tk_root.after(start_ms, param_panel._on_slider_press)
+    # Simuler 10 changements rapides, 50ms entre chaque changement (1.0 → 1.9)
+    for i in range(10):
+        tk_root.after(start_ms + i * 50, functools.partial(change, 1.0 + i * 0.1))
+    tk_root.after(start_ms + 9 * 50 + 10, release)
+
+    def analyze_results():
+        """Analyse les résultats du test"""
         print()
-        print("✅ Test slider debouncing RÉUSSI")
-        
-        return True
-        
-    except ImportError as e:
-        print(f"❌ Erreur import: {e}")
-        return False
-    except Exception as e:
-        print(f"❌ Erreur test: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        print("📊 RÉSULTATS DEBOUNCING:")
+        print(f"   Changements simulés: 10")
+        print(f"   Updates callback: {update_call_count}")
+        print(f"   Réduction: {(1 - update_call_count/10)*100:.1f}%")
+
+        if update_times:
+            avg_delay = sum(update_times) / len(update_times)
+            print(f"   Délai moyen entre updates: {avg_delay:.1f}ms")
+
+        tk_root.quit()
+
+    # Analyser les résultats une fois tous les updates traités
+    tk_root.after(start_ms + 600, analyze_results)
+
+    # Garde-fou: ne jamais bloquer plus de 10 secondes
+    timeout_id = tk_root.after(10000, tk_root.quit)
+    tk_root.mainloop()
+    tk_root.after_cancel(timeout_id)
+    window.destroy()
+
+    assert update_call_count >= 1, "Aucun update après la rafale de changements"
+    assert update_call_count <= MAX_UPDATES, \
+        f"{update_call_count} updates pour 10 changements (max {MAX_UPDATES})"
+    assert release_updates == 1, \
+        f"{release_updates} update(s) pendant le relâchement (attendu: 1, sans attendre le timer)"
+
+    # Previews intermédiaires en basse résolution, pleine résolution au relâchement
+    assert all(scale == DRAFT_SCALE for scale in update_scales[:-1]), f"Échelles: {update_scales}"
+    assert update_scales[-1] == 1.0, f"Dernier update pas en pleine résolution: {update_scales}"
+
+    print()
+    print("✅ Test slider debouncing RÉUSSI")
+
+
+def test_update_callback_scale_detection():
+    """Seuls les callbacks acceptant `scale` reçoivent l'échelle brouillon"""
+    from src.ui_components import ParameterPanel
+
+    def update_preview(scale=1.0):
+        pass
+
+    assert ParameterPanel._accepts_scale(update_preview)
+    assert ParameterPanel._accepts_scale(lambda **kwargs: None)
+    assert not ParameterPanel._accepts_scale(lambda: None)
+    assert not ParameterPanel._accepts_scale(None)
+
+
+def test_drag_with_callback_without_scale(tk_root):
+    """Un callback sans argument reste appelé sans argument pendant le glissement"""
+    from src.image_processing import ImageProcessor
+    from src.ui_components import ParameterPanel
+    import tkinter as tk
+
+    window = tk.Toplevel(tk_root)
+    window.withdraw()
+    calls = []
+    try:
+        param_panel = ParameterPanel(window, ImageProcessor(), lambda: calls.append(None))
+        calls.clear()
+
+        param_panel._on_slider_press()
+        param_panel.on_parameter_change('beer_lambert_red_coeff', 0.7)
+        param_panel._on_slider_release()
+
+        # Update immédiat à l'appui, en pleine résolution: rien à rafraîchir au relâchement
+        assert len(calls) == 1
+    finally:
+        window.destroy()
+
+
+def test_draft_preview_pixels(processor):
+    """La preview brouillon traite ~16x moins de pixels et garde la taille de l'image"""
+    image = np.full((256, 384, 3), 128, dtype=np.uint8)
+
+    # Mesurer la taille réellement reçue par le pipeline
+    processed_pixels = []
+    apply_white_balance = processor.apply_white_balance
+
+    def spy_white_balance(img):
+        processed_pixels.append(img.shape[0] * img.shape[1])
+        return apply_white_balance(img)
+
+    with patch.object(processor, 'apply_white_balance', spy_white_balance), \
+            patch.dict(processor.parameters, {'white_balance_enabled': True}):
+        original_preview, draft_preview, _ = processor.process_image_for_preview(image, scale=DRAFT_SCALE)
+        draft_image = processor.process_image(image, scale=DRAFT_SCALE)
+
+    assert draft_preview.shape == original_preview.shape
+    assert draft_image.shape == image.shape
+
+    full_pixels = image.shape[0] * image.shape[1]
+    print(f"   Pixels par update intermédiaire: {full_pixels:,} -> {processed_pixels}")
+    assert processed_pixels == [full_pixels // 16] * 2
+
 
 if __name__ == "__main__":
-    success = test_slider_responsiveness()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
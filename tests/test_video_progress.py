@@ -4,119 +4,118 @@ Test spécifique pour la progression granulaire des vidéos
 Simule le traitement vidéo avec progression par frame et par étape
 """
 
+import os
 import sys
-sys.path.insert(0, '.')
+from concurrent.futures import ThreadPoolExecutor
+import time
 
-def test_video_progress_simulation():
-    """Simule le traitement vidéo avec progression granulaire"""
+import numpy as np
+import pytest
+
+from src.image_processing import ImageProcessor
+
+# Nombre de frames simulées (petit nombre pour test rapide)
+TOTAL_FRAMES = 5
+
+# Intervalle par défaut entre deux updates transmises par process_image (secondes)
+PROGRESS_INTERVAL = 0.05
+
+
+def simulate_video(processor, rng, **progress_options):
+    """Traite TOTAL_FRAMES frames distinctes comme save_video
+
+    ImageProcessor n'est pas protégé par un verrou: chaque frame est traitée par
+    son propre processeur, configuré avec les paramètres de `processor`.
+    Retourne, par frame, la liste des updates (message, pourcentage global) et la durée.
+    """
+    frames = [rng.integers(50, 200, (50, 50, 3), dtype=np.uint8) for _ in range(TOTAL_FRAMES)]
+    frame_processors = []
+    for _ in range(TOTAL_FRAMES):
+        frame_processor = ImageProcessor()
+        frame_processor.set_parameters(processor.parameters)
+        frame_processors.append(frame_processor)
+
+    def process_frame(frame_num):
+        """Traite une frame; retourne (updates, durée)"""
+        frame_progress_updates = []
+
+        def frame_callback(message, percentage):
+            # Calculer la progression globale comme dans save_video
+            frame_start = 10 + (frame_num * 80 // TOTAL_FRAMES)
+            frame_end = 10 + ((frame_num + 1) * 80 // TOTAL_FRAMES)
+            frame_range = frame_end - frame_start
+            adjusted_percentage = frame_start + (percentage * frame_range // 100)
+
+            global_message = f"Frame {frame_num + 1}/{TOTAL_FRAMES}: {message}"
+            # Enregistrer seulement: l'affichage se fait hors de process_image
+            frame_progress_updates.append((global_message, adjusted_percentage))
+
+        start = time.monotonic()
+        processed_frame = frame_processors[frame_num].process_image(
+            frames[frame_num], progress_callback=frame_callback, **progress_options)
+        assert processed_frame is not None
+        return frame_progress_updates, time.monotonic() - start
+
+    # Traiter les frames en parallèle (OpenCV et NumPy libèrent le GIL)
+    with ThreadPoolExecutor(max_workers=min(TOTAL_FRAMES, os.cpu_count() or 1)) as executor:
+        frame_results = list(executor.map(process_frame, range(TOTAL_FRAMES)))
+
+    for frame_num, (frame_progress_updates, elapsed) in enumerate(frame_results):
+        print(f"\n📊 Frame {frame_num + 1}/{TOTAL_FRAMES} ({elapsed * 1000:.0f}ms):")
+        # Une seule écriture par frame plutôt qu'un print par étape
+        print("\n".join(f"    📈 {adjusted_percentage:3.0f}% - {global_message}"
+                        for global_message, adjusted_percentage in frame_progress_updates))
+
+    return frame_results
+
+
+def check_coverage(frame_results):
+    """Chaque frame reste dans sa plage et l'ensemble couvre environ 10-85%"""
+    for frame_num, (frame_progress_updates, _) in enumerate(frame_results):
+        assert frame_progress_updates, f"Aucune update pour la frame {frame_num + 1}"
+        frame_start = 10 + (frame_num * 80 // TOTAL_FRAMES)
+        frame_end = 10 + ((frame_num + 1) * 80 // TOTAL_FRAMES)
+        percentages = [percentage for _, percentage in frame_progress_updates]
+        assert all(frame_start <= p <= frame_end for p in percentages), \
+            f"Frame {frame_num + 1}: {percentages} hors de [{frame_start}, {frame_end}]"
+        assert all(f"Frame {frame_num + 1}/" in message for message, _ in frame_progress_updates)
+
+    percentages = [p for updates, _ in frame_results for _, p in updates]
+    print(f"\n   📊 Progression globale: {min(percentages):.0f}% → {max(percentages):.0f}%")
+    assert min(percentages) <= 15 and max(percentages) >= 80, "Couverture attendue: 10-85%"
+
+
+def test_video_progress_every_step(processor, rng):
+    """Sans limitation (intervalle nul), chaque étape de chaque frame est transmise"""
     print("🎬 TEST: Progression granulaire pour vidéos")
     print("=" * 60)
-    
-    try:
-        from src.image_processing import ImageProcessor
-        import numpy as np
-        
-        processor = ImageProcessor()
-        
-        # Simuler des frames de vidéo
-        total_frames = 5  # Petit nombre pour test rapide
-        print(f"🎥 Simulation traitement vidéo: {total_frames} frames")
-        
-        all_progress_updates = []
-        
-        for frame_num in range(total_frames):
-            print(f"\n📊 Frame {frame_num + 1}/{total_frames}:")
-            
-            # Créer une frame test
-            test_frame = np.random.randint(50, 200, (50, 50, 3), dtype=np.uint8)
-            
-            frame_progress_updates = []
-            
-            def frame_callback(message, percentage):
-                # Calculer la progression globale comme dans save_video
-                frame_start = 10 + (frame_num * 80 // total_frames)
-                frame_end = 10 + ((frame_num + 1) * 80 // total_frames)
-                frame_range = frame_end - frame_start
-                adjusted_percentage = frame_start + (percentage * frame_range // 100)
-                
-                global_message = f"Frame {frame_num + 1}/{total_frames}: {message}"
-                frame_progress_updates.append((global_message, adjusted_percentage))
-                print(f"    📈 {adjusted_percentage:3.0f}% - {global_message}")
-            
-            # Traiter la frame
-            processed_frame = processor.process_image(test_frame, progress_callback=frame_callback)
-            
-            print(f"    ✅ Frame traitée: {processed_frame is not None}")
-            print(f"    📊 Steps pour cette frame: {len(frame_progress_updates)}")
-            
-            all_progress_updates.extend(frame_progress_updates)
-        
-        print(f"\n🎯 RÉSUMÉ VIDÉO:")
-        print(f"   📊 Total updates reçues: {len(all_progress_updates)}")
-        print(f"   🎬 Frames traitées: {total_frames}")
-        print(f"   📈 Updates par frame (moyenne): {len(all_progress_updates) / total_frames:.1f}")
-        
-        # Vérifier progression globale
-        coverage_ok = False
-        if all_progress_updates:
-            percentages = [update[1] for update in all_progress_updates]
-            min_progress = min(percentages)
-            max_progress = max(percentages)
-            
-            print(f"   📊 Progression globale: {min_progress:.0f}% → {max_progress:.0f}%")
-            
-            # Vérifier que la progression couvre bien la plage 10-90%
-            expected_min = 10
-            expected_max = 85  # Environ 90% moins les dernières étapes
-            
-            coverage_ok = min_progress <= expected_min + 5 and max_progress >= expected_max - 5
-            print(f"   ✅ Couverture attendue (10-85%): {'✅' if coverage_ok else '❌'}")
-        
-        # Test progression frame par frame
-        frame_ranges = {}
-        for update in all_progress_updates:
-            message = update[0]
-            percentage = update[1]
-            
-            # Extraire le numéro de frame du message
-            if "Frame " in message:
-                try:
-                    frame_part = message.split("Frame ")[1].split("/")[0]
-                    frame_num = int(frame_part)
-                    
-                    if frame_num not in frame_ranges:
-                        frame_ranges[frame_num] = []
-                    frame_ranges[frame_num].append(percentage)
-                except:
-                    pass
-        
-        print(f"\n📈 PROGRESSION PAR FRAME:")
-        for frame_num in sorted(frame_ranges.keys()):
-            percentages = frame_ranges[frame_num]
-            frame_min = min(percentages)
-            frame_max = max(percentages)
-            print(f"   Frame {frame_num}: {frame_min:.0f}% → {frame_max:.0f}% ({len(percentages)} étapes)")
-        
-        # Validation finale
-        tests_passed = (
-            len(all_progress_updates) > 0 and
-            len(frame_ranges) == total_frames and
-            coverage_ok
-        )
-        
-        if tests_passed:
-            print("\n🎉 TEST VIDÉO RÉUSSI - Progression granulaire par frame fonctionnelle!")
-            return True
-        else:
-            print("\n⚠️  Test vidéo partiellement échoué")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Erreur pendant test vidéo: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+
+    frame_results = simulate_video(processor, rng, progress_interval_ms=0, progress_count=-1)
+    check_coverage(frame_results)
+
+    enabled_steps = sum(processor.parameters[flag] for flag in (
+        'white_balance_enabled', 'udcp_enabled', 'beer_lambert_enabled',
+        'color_rebalance_enabled', 'hist_eq_enabled', 'multiscale_fusion_enabled'))
+    for frame_progress_updates, _ in frame_results:
+        assert len(frame_progress_updates) == enabled_steps
+
+    print("\n🎉 TEST VIDÉO RÉUSSI - Progression granulaire par frame fonctionnelle!")
+
+
+@pytest.mark.parametrize("interval_ms, count", [(None, -1), (100, -1), (10_000, 4)],
+                         ids=["defaut", "intervalle_100ms", "quatre_tranches"])
+def test_video_progress_throttled(processor, rng, interval_ms, count):
+    """Les updates sont bornées par le temps écoulé (et le nombre de tranches demandé)"""
+    frame_results = simulate_video(processor, rng, progress_interval_ms=interval_ms, progress_count=count)
+    check_coverage(frame_results)
+
+    interval = PROGRESS_INTERVAL if interval_ms is None else interval_ms / 1000
+    for frame_num, (frame_progress_updates, elapsed) in enumerate(frame_results):
+        # Première et dernière étape + une par intervalle (+ une par tranche)
+        max_updates = 2 + int(elapsed / interval) + max(count, 0)
+        print(f"   Frame {frame_num + 1}: {len(frame_progress_updates)} updates (max {max_updates})")
+        assert len(frame_progress_updates) <= max_updates
+
 
 if __name__ == "__main__":
-    success = test_video_progress_simulation()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
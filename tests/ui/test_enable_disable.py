@@ -11,17 +11,15 @@ from src.image_processing import ImageProcessor
 def create_test_image():
     """Create a simple test image"""
     height, width = 200, 300
-    img = np.zeros((height, width, 3), dtype=np.uint8)
     
-    # Create a gradient with underwater characteristics
-    for y in range(height):
-        depth_factor = y / height
-        blue_val = int(120 - depth_factor * 30)
-        green_val = int(100 - depth_factor * 50)
-        red_val = int(80 - depth_factor * 60)
-        img[y, :] = [max(0, blue_val), max(0, green_val), max(0, red_val)]
+    # Create a gradient with underwater characteristics, one depth factor per row
+    depth_factor = np.arange(height)[:, None] / height
+    blue = np.clip(120 - depth_factor * 30, 0, 255)
+    green = np.clip(100 - depth_factor * 50, 0, 255)
+    red = np.clip(80 - depth_factor * 60, 0, 255)
     
-    return img
+    column = np.stack([blue, green, red], axis=-1).astype(np.uint8)
+    return np.ascontiguousarray(np.broadcast_to(column, (height, width, 3)))
 
 def test_enable_disable_functionality():
     """Test enable/disable functionality for each processing step"""
@@ -59,14 +57,15 @@ def test_enable_disable_functionality():
     print(f"   Processed mean (all disabled): {processed_mean_disabled:.1f}")
     print(f"   Change: {processed_mean_disabled - original_mean:+.1f}")
     
-    # Check if image is unchanged (should be very close to original)
-    image_unchanged = np.allclose(test_image, result_all_disabled, atol=1)
+    # Check if image is unchanged (the pipeline returns its input as is)
+    image_unchanged = (result_all_disabled is test_image
+                       or np.array_equal(test_image, result_all_disabled))
     if image_unchanged:
         print(f"   ✅ SUCCESS: Image unchanged when all steps disabled!")
     else:
         print(f"   ❌ ERROR: Image changed even with all steps disabled!")
-        diff = np.mean(np.abs(test_image.astype(float) - result_all_disabled.astype(float)))
-        print(f"   Average pixel difference: {diff:.3f}")
+        diff = np.abs(test_image.astype(np.int16) - result_all_disabled.astype(np.int16))
+        print(f"   Average pixel difference: {diff.mean():.3f}")
     
     # Test individual steps
     print(f"\n🟡 TEST 3: Individual step testing")
@@ -82,15 +81,15 @@ def test_enable_disable_functionality():
     
     individual_results = {}
     
+    # Start from all steps disabled, then enable one step at a time
+    for test_param, _ in step_tests:
+        processor.set_parameter(test_param, False)
+    
     for param_name, step_name in step_tests:
-        # Reset all to disabled
-        for test_param, _ in step_tests:
-            processor.set_parameter(test_param, False)
-        
-        # Enable only this step
         processor.set_parameter(param_name, True)
-        
         result = processor.process_image(test_image)
+        processor.set_parameter(param_name, False)
+        
         mean_change = np.mean(result) - original_mean
         individual_results[step_name] = mean_change
         
@@ -5,6 +5,9 @@ import sys
 import numpy as np
 from src.image_processing import ImageProcessor
 
+# Image test partagée (lecture seule: process_image ne modifie pas son entrée)
+_TEST_IMG = np.random.default_rng(0).integers(50, 200, (100, 150, 3), dtype=np.uint8)
+
 def test_global_reset():
     """Test the global reset functionality."""
     print("Testing global reset functionality...")
@@ -26,11 +29,22 @@ def test_global_reset():
     }
     
     print("\nModifying parameters to non-default values...")
+    old_values = {param: processor.get_parameter(param) for param in test_changes}
+    with processor.batch_updates():
+        for param, new_value in test_changes.items():
+            processor.set_parameter(param, new_value)
+            
+            # Visible right away, but applied to the pipeline only at the end of the batch
+            if processor.get_parameter(param) != new_value:
+                print(f"✗ Queued value of {param} not visible inside the batch")
+                return False
+            if processor.parameters[param] != old_values[param]:
+                print(f"✗ Parameter {param} applied before the end of the batch")
+                return False
+    
     for param, new_value in test_changes.items():
-        old_value = processor.get_parameter(param)
-        processor.set_parameter(param, new_value)
         current_value = processor.get_parameter(param)
-        print(f"  {param}: {old_value} → {current_value}")
+        print(f"  {param}: {old_values[param]} → {current_value}")
         
         # Verify change was applied
         if current_value != new_value:
@@ -39,9 +53,7 @@ def test_global_reset():
     
     # Reset all parameters using the method similar to UI
     print("\nResetting all parameters to defaults...")
-    default_params = processor.get_default_parameters()
-    for param_name, default_value in default_params.items():
-        processor.set_parameter(param_name, default_value)
+    processor.set_parameters(original_defaults)
     
     # Verify all parameters are back to defaults
     print("\nVerifying reset was successful...")
@@ -64,7 +76,7 @@ def test_pipeline_after_reset():
     processor = ImageProcessor()
     
     # Create test image
-    test_image = np.random.randint(50, 200, (100, 150, 3), dtype=np.uint8)
+    test_image = _TEST_IMG
     
     # Process with default parameters
     try:
@@ -5,125 +5,116 @@ Test spécifique pour vérifier la barre de progression du chargement d'image
 
 import sys
 import os
-from pathlib import Path
 
-# Assurer le chemin vers le projet
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
+import pytest
 
-def test_image_loading_progress():
+def test_image_loading_progress(app):
     """Test la barre de progression lors du chargement d'image"""
     print("🔍 Test barre de progression - Chargement d'image")
-    
+
     try:
-        # Import du main module
-        from src.main import ImageProcessorApp
-        import tkinter as tk
-        
-        print("✅ Import réussi")
-        
-        # Créer l'application
-        root = tk.Tk()
-        app = ImageProcessorApp(root)
-        
-        print("✅ Application créée")
-        
+        print("✅ Application partagée prête")
+
         # Simuler le chargement d'une image de test
         test_image_path = "test_images/underwater_test.jpg"
         if os.path.exists(test_image_path):
             print(f"📸 Test avec image: {test_image_path}")
-            
+
             # Définir le fichier courant
             app.files_list = [test_image_path]
             app.current_index = 0
-            
+
             # Simuler le chargement
             print("🚀 Lancement du chargement avec barre de progression...")
             app.load_current_file()
-            
+
             print("✅ Chargement terminé!")
-            
+
         else:
             print(f"❌ Image de test non trouvée: {test_image_path}")
-        
-        # Nettoyer
-        root.destroy()
+
         print("✅ Test complété")
-        
+
     except Exception as e:
         print(f"❌ Erreur durant le test: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # L'application est partagée par toute la session
+        app.files_list = []
+        app.current_index = 0
+
+# Délai entre deux étapes simulées (millisecondes)
+STEP_MS = 100
+
+def run_scheduled(root, steps):
+    """Exécute les étapes (délai_ms, action) via root.after, la boucle Tk restant active entre elles"""
+    elapsed = 0
+    for delay_ms, action in steps:
+        elapsed += delay_ms
+        root.after(elapsed, action)
+    root.after(elapsed, root.quit)
+    root.mainloop()
 
-def test_progress_dialog_directly():
+def test_progress_dialog_directly(tk_root):
     """Test direct du composant ProgressDialog"""
     print("\n🔍 Test direct ProgressDialog")
-    
+
+    import tkinter as tk
+
+    # Fenêtre parente cachée, détruite à la fin du test
+    parent = tk.Toplevel(tk_root)
+    parent.withdraw()
+
     try:
-        import tkinter as tk
-        
         # Import du composant
-        sys.path.insert(0, str(Path(__file__).parent / "src"))
-        from progress_bar import ProgressDialog, show_progress
-        
+        from src.progress_bar import ProgressDialog, show_progress
+
         print("✅ Import progress_bar réussi")
-        
+
         # Test avec contexte manager
-        root = tk.Tk()
-        root.withdraw()  # Cache la fenêtre principale
-        
         print("📊 Test avec show_progress...")
-        with show_progress(root, "Test Chargement", "Simulation chargement image...") as progress:
-            import time
-            
-            progress.update_message("Lecture du fichier...")
-            time.sleep(0.5)
-            
-            progress.update_message("Conversion RGB...")
-            time.sleep(0.5)
-            
-            progress.update_message("Auto-tune...")
-            time.sleep(0.5)
-            
-            progress.update_message("Génération aperçu...")
-            time.sleep(0.3)
-        
+        context = show_progress(parent, "Test Chargement", "Simulation chargement image...")
+        progress = context.__enter__()
+        run_scheduled(tk_root, [
+            (0, lambda: progress.update_message("Lecture du fichier...")),
+            (STEP_MS, lambda: progress.update_message("Conversion RGB...")),
+            (STEP_MS, lambda: progress.update_message("Auto-tune...")),
+            (STEP_MS, lambda: progress.update_message("Génération aperçu...")),
+            (STEP_MS, lambda: context.__exit__(None, None, None)),
+        ])
+
         print("✅ Test show_progress réussi!")
-        
+
         # Test direct ProgressDialog
         print("📊 Test ProgressDialog direct...")
-        dialog = ProgressDialog(root, "Test Direct", "Initialisation...")
+        dialog = ProgressDialog(parent, "Test Direct", "Initialisation...")
         dialog.show()
-        
-        import time
-        time.sleep(0.3)
-        dialog.update_message("Étape 1...")
-        time.sleep(0.3)
-        dialog.update_message("Étape 2...")
-        time.sleep(0.3)
-        dialog.update_message("Finalisation...")
-        time.sleep(0.3)
-        
-        dialog.hide()
+        run_scheduled(tk_root, [
+            (STEP_MS, lambda: dialog.update_message("Étape 1...")),
+            (STEP_MS, lambda: dialog.update_message("Étape 2...")),
+            (STEP_MS, lambda: dialog.update_message("Finalisation...")),
+            (STEP_MS, dialog.hide),
+        ])
         print("✅ Test ProgressDialog direct réussi!")
-        
-        root.destroy()
-        
+
     except Exception as e:
         print(f"❌ Erreur test direct: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        parent.destroy()
 
 if __name__ == "__main__":
     print("🚀 TEST BARRES DE PROGRESSION - CHARGEMENT D'IMAGE")
     print("=" * 60)
-    
-    test_progress_dialog_directly()
-    test_image_loading_progress()
-    
+
+    exit_code = pytest.main([__file__, "-v", "-s"])
+
     print("\n" + "=" * 60)
     print("💡 Pour test manuel:")
     print("   1. Lancez: python main.py")
     print("   2. Cliquez 'Browse File'")
     print("   3. Sélectionnez une image")
     print("   4. Observez la barre de progression")
+    sys.exit(exit_code)
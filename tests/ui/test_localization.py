@@ -3,7 +3,7 @@
 Test simple du système de localisation
 """
 
-from src.localization import get_localization_manager, t, set_language
+from src.localization import LocalizationManager, get_localization_manager, t, set_language
 
 def test_localization():
     """Test des traductions"""
@@ -31,6 +31,38 @@ def test_localization():
     # Test avec formatage
     print(f"Formatage: {t('file_info', filename='test.jpg', index=1, total=5)}")
 
+def test_translation_cache(tmp_path):
+    """Cache des traductions: réutilisation, invalidation et arguments non hachables"""
+    manager = LocalizationManager(default_language='fr')
+    # Ne pas écraser la préférence de langue de l'utilisateur
+    manager.config_file = tmp_path / 'aqualix_config.json'
+    manager.set_language('fr')
+    
+    # Même chaîne retournée depuis le cache, même si le dictionnaire change ensuite
+    manager.translations['fr']['app_title'] = 'Titre modifié'
+    title = manager.t('app_title')
+    assert title == 'Titre modifié'
+    manager.translations['fr']['app_title'] = 'Autre titre'
+    assert manager.t('app_title') is title
+    
+    # load_translations vide le cache: la traduction rechargée est retournée
+    manager.load_translations()
+    assert manager.t('app_title') == "Aqualix - Traitement d'Images et Vidéos"
+    
+    # Les arguments de formatage font partie de la clé
+    assert manager.t('file_info', filename='a.jpg', index=1, total=2) == 'Fichier: a.jpg (1/2)'
+    assert manager.t('file_info', total=2, index=1, filename='b.jpg') == 'Fichier: b.jpg (1/2)'
+    
+    # set_language vide le cache: la nouvelle langue est retournée
+    manager.set_language('en')
+    assert manager.t('file_info', filename='a.jpg', index=1, total=2) == 'File: a.jpg (1/2)'
+    assert manager.t('app_title') == manager.translations['en']['app_title']
+    
+    # Argument non hachable: traduction sans passer par le cache
+    cache_size = len(manager._cache)
+    assert manager.t('file_info', filename=['a.jpg'], index=1, total=2) == "File: ['a.jpg'] (1/2)"
+    assert len(manager._cache) == cache_size
+
 if __name__ == "__main__":
     test_localization()
 
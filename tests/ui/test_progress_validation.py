@@ -4,30 +4,25 @@ Test de validation des barres de progression
 Vérifie que les nouvelles barres de progression fonctionnent correctement
 """
 
-import sys
 import os
 import time
 import tkinter as tk
-from pathlib import Path
 
-# Add src to path for imports
-sys.path.insert(0, str(Path(__file__).parent / "src"))
-
-def test_progress_components():
+def test_progress_components(tk_root):
     """Test les composants de barre de progression"""
     print("🔍 Test des composants de barre de progression...")
     
     # Test import
     try:
-        from progress_bar import ProgressDialog, ProgressManager, show_progress, InlineProgressBar
+        from src.progress_bar import ProgressDialog, ProgressManager, show_progress, InlineProgressBar
         print("✅ Import des composants réussi")
     except ImportError as e:
         print(f"❌ Erreur import: {e}")
         return False
     
-    # Test création fenêtre racine
-    root = tk.Tk()
-    root.withdraw()  # Cache la fenêtre principale
+    # Fenêtre parente cachée sur la racine Tk partagée
+    root = tk.Toplevel(tk_root)
+    root.withdraw()
     
     try:
         # Test 1: ProgressDialog direct
@@ -36,7 +31,7 @@ def test_progress_components():
         dialog.update_message("Test en cours...")
         dialog.update_progress(50)
         dialog.update_message("Finalisation...")
-        dialog.close()
+        dialog.hide()
         print("✅ ProgressDialog fonctionne")
         
         # Test 2: ProgressManager context manager
@@ -109,18 +104,15 @@ def test_imports_and_structure():
             print(f"❌ {file_path} manquant")
             return False
     
-    # Test imports relatifs
+    # Test imports relatifs (via le paquet src, sans changer de répertoire)
     try:
-        os.chdir("src")
-        import progress_bar
-        import main
+        from src import progress_bar
+        from src import main
         print("✅ Imports relatifs fonctionnent")
         return True
     except Exception as e:
         print(f"❌ Erreur imports relatifs: {e}")
         return False
-    finally:
-        os.chdir("..")
 
 def main():
     """Fonction principale de test"""
@@ -129,10 +121,14 @@ def main():
     
     tests = [
         ("Structure et imports", test_imports_and_structure),
-        ("Composants progress bar", test_progress_components),
+        ("Composants progress bar", lambda: test_progress_components(root)),
         ("Intégration main.py", test_main_integration)
     ]
     
+    # Racine Tk cachée, comme le fixture tk_root sous pytest
+    root = tk.Tk()
+    root.withdraw()
+    
     results = []
     for test_name, test_func in tests:
         print(f"\n📋 {test_name}...")
@@ -144,6 +140,7 @@ def main():
         except Exception as e:
             print(f"   → ❌ ERREUR: {e}")
             results.append(False)
+    root.destroy()
     
     # Résumé final
     print("\n" + "=" * 60)
@@ -18,9 +18,10 @@ def test_reset_defaults():
     print(f"   Saturation limit: {processor.get_parameter('color_rebalance_saturation_limit')}")
     
     # Modify parameters
-    processor.set_parameter('color_rebalance_rr', 0.5)
-    processor.set_parameter('color_rebalance_rg', 0.3)
-    processor.set_parameter('color_rebalance_saturation_limit', 0.6)
+    with processor.batch_updates():
+        processor.set_parameter('color_rebalance_rr', 0.5)
+        processor.set_parameter('color_rebalance_rg', 0.3)
+        processor.set_parameter('color_rebalance_saturation_limit', 0.6)
     
     print("\n2. After modifications:")
     print(f"   RR: {processor.get_parameter('color_rebalance_rr')}")
@@ -58,6 +59,28 @@ def test_reset_defaults():
     
     return success
 
+def test_batch_updates_mixed_writes():
+    """set_parameter and set_parameters share the batch queue, in call order"""
+    processor = ImageProcessor()
+    default_omega = processor.get_parameter('udcp_omega')
+    
+    with processor.batch_updates():
+        processor.set_parameter('udcp_omega', 0.5)
+        processor.set_parameters({'udcp_omega': 0.9, 'udcp_t0': 0.2})
+        
+        # Queued values are visible, the pipeline still reads the committed ones
+        assert processor.get_parameter('udcp_omega') == 0.9
+        assert processor.get_all_parameters()['udcp_t0'] == 0.2
+        assert processor.parameters['udcp_omega'] == default_omega
+        
+        processor.set_parameter('udcp_t0', 0.15)
+        processor.reset_step_parameters('color_rebalance')
+    
+    assert processor.get_parameter('udcp_omega') == 0.9
+    assert processor.get_parameter('udcp_t0') == 0.15
+    assert processor.get_parameter('color_rebalance_rr') == 1.0
+
 if __name__ == "__main__":
     test_reset_defaults()
+    test_batch_updates_mixed_writes()
 
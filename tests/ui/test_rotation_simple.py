@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test simple de la rotation du panneau d'aperçu interactif
+Le libellé de rotation est mis à jour par callback, sans polling via after()
+"""
+
+import sys
+
+import pytest
+
+def test_rotation_label_follows_rotation(tk_root):
+    """Le callback n'est appelé que lorsque l'angle change réellement"""
+    import tkinter as tk
+    from tkinter import ttk
+    from src.ui_components import InteractivePreviewPanel
+
+    window = tk.Toplevel(tk_root)
+    window.withdraw()
+
+    try:
+        preview_panel = InteractivePreviewPanel(window)
+        rotation_label = ttk.Label(window, text="Rotation: 0°")
+        rotations = []
+
+        def on_rotation(rotation):
+            rotations.append(rotation)
+            rotation_label.config(text=f"Rotation: {rotation:.0f}°")
+
+        preview_panel.on_rotation_change(on_rotation)
+
+        preview_panel.rotate_left()
+        assert rotation_label.cget("text") == "Rotation: 90°"
+        preview_panel.rotate_right()
+        preview_panel.rotate_right()
+        assert rotation_label.cget("text") == "Rotation: 270°"
+
+        # Réinitialiser deux fois: une seule notification (270° → 0°)
+        preview_panel.reset_view()
+        preview_panel.reset_view()
+
+        print(f"📐 Rotations notifiées: {rotations}")
+        assert rotations == [90, 0, 270, 0]
+        assert rotation_label.cget("text") == "Rotation: 0°"
+    finally:
+        window.destroy()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -13,6 +13,16 @@ from pathlib import Path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 sys.path.append(os.path.dirname(__file__))
 
+def _create_test_image():
+    """Image de test avec biais bleu pour simuler une image sous-marine"""
+    test_image = np.random.default_rng(0).integers(50, 200, (300, 400, 3), dtype=np.uint8)
+    test_image[:, :, 0] = test_image[:, :, 0] * 0.6  # Réduire rouge
+    test_image[:, :, 1] = test_image[:, :, 1] * 0.8  # Réduire vert
+    return test_image
+
+# Image de test créée une seule fois pour tous les tests du module
+_TEST_IMAGE = _create_test_image()
+
 def test_quality_consistency():
     """Test si le contrôle qualité donne des résultats différents selon les paramètres"""
     print("🔍 TEST BUG CONTRÔLE QUALITÉ")
@@ -22,12 +32,8 @@ def test_quality_consistency():
         from src.image_processing import ImageProcessor
         from src.quality_check import PostProcessingQualityChecker
         
-        # Créer une image de test
-        test_image = np.random.randint(50, 200, (300, 400, 3), dtype=np.uint8)
-        # Ajouter un biais bleu pour simuler une image sous-marine
-        test_image[:, :, 0] = test_image[:, :, 0] * 0.6  # Réduire rouge
-        test_image[:, :, 1] = test_image[:, :, 1] * 0.8  # Réduire vert
-        test_image = test_image.astype(np.uint8)
+        # Image de test partagée (jamais modifiée)
+        test_image = _TEST_IMAGE
         
         print(f"📊 Image de test créée: {test_image.shape}")
         
@@ -120,5 +126,39 @@ def test_quality_consistency():
         traceback.print_exc()
         return False
 
+def test_reference_features_reused():
+    """Les caractéristiques de l'image originale sont calculées une fois pour plusieurs comparaisons"""
+    from src.image_processing import ImageProcessor
+    from src.quality_check import PostProcessingQualityChecker
+    
+    processor = ImageProcessor()
+    processed = processor.process_image(_TEST_IMAGE)
+    processed_draft = processor.process_image(_TEST_IMAGE, scale=0.5)
+    
+    quality_checker = PostProcessingQualityChecker()
+    quality_checker.run_all_checks(_TEST_IMAGE, _TEST_IMAGE)
+    features = quality_checker._reference_cache[1]
+    
+    results = quality_checker.run_all_checks(_TEST_IMAGE, processed)
+    quality_checker.run_all_checks(_TEST_IMAGE, processed_draft)
+    assert quality_checker._reference_cache[1] is features
+    
+    # Mêmes résultats qu'avec un contrôleur neuf
+    assert results == PostProcessingQualityChecker().run_all_checks(_TEST_IMAGE, processed)
+    
+    # Un autre tableau original (même de contenu identique) remplace les caractéristiques
+    quality_checker.run_all_checks(_TEST_IMAGE.copy(), processed)
+    assert quality_checker._reference_cache[1] is not features
+    
+    # Modification en place: invalidate() force le recalcul
+    original = _TEST_IMAGE.copy()
+    quality_checker.run_all_checks(original, processed)
+    features = quality_checker._reference_cache[1]
+    original[:10] = 0
+    quality_checker.invalidate()
+    assert quality_checker.run_all_checks(original, processed) == PostProcessingQualityChecker().run_all_checks(original, processed)
+    assert quality_checker._reference_cache[1] is not features
+
 if __name__ == "__main__":
     test_quality_consistency()
+    test_reference_features_reused()